@@ -1,20 +1,35 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from functools import cache, cached_property
-from itertools import combinations
+from functools import cached_property
+from weakref import WeakKeyDictionary
 
 from os import path
-from typing import TextIO, Iterable
+from typing import Callable, TextIO, Iterable
 
 import gurobipy as gp
 import networkx as nx
+import numpy as np
 from gurobipy import GRB
+from scipy import sparse
 
 from src.bc_bounds import find_bc_upper_bound, find_bc_lower_bound, UBComputeMethod, get_vertex_cover_solution, \
-    LBComputeMethod, compute_lb_and_get_edges_by_independent_edges_method
+    LBComputeMethod, compute_lb_and_get_edges_by_independent_edges_method, get_grb_env
 from src.config import RunConfig, ReportConfig
 
 
+# upper bound on the number of edge pairs materialized at once by get_disjoint_edges
+_DISJOINT_EDGE_PAIR_CHUNK = 4_000_000
+
+# row layout of the disjoint-edge pool: endpoints of both edges as node_list
+# indices plus the two crossing counts
+_DISJOINT_EDGE_DTYPE = np.dtype(
+    [('a', 'i4'), ('b', 'i4'), ('c', 'i4'), ('d', 'i4'), ('cr1', 'i1'), ('cr2', 'i1')])
+
+# expensive derivatives shared by every model built on the same graph object
+# (e.g. several formulations in a benchmark grid); entries die with the graph
+_graph_derivatives: WeakKeyDictionary = WeakKeyDictionary()
+
+
 class MBCModel(ABC):
 
     def __init__(
@@ -59,6 +74,30 @@ class MBCModel(ABC):
             self._config.use_callback) \
             if self._config.use_callback is not None else (
             self._default_config.default_use_callback)
+        self._verify_solution = (
+            self._config.verify_solution) \
+            if self._config.verify_solution is not None \
+            else self._default_config.default_verify_solution
+        self._write_model = (
+            self._config.write_model) \
+            if self._config.write_model is not None \
+            else self._default_config.default_write_model
+        self._threads = (
+            self._config.threads) \
+            if self._config.threads is not None \
+            else self._default_config.default_threads
+        self._method = (
+            self._config.method) \
+            if self._config.method is not None \
+            else self._default_config.default_method
+        self._mip_focus = (
+            self._config.mip_focus) \
+            if self._config.mip_focus is not None \
+            else self._default_config.default_mip_focus
+        self._presolve = (
+            self._config.presolve) \
+            if self._config.presolve is not None \
+            else self._default_config.default_presolve
         self._callback = None
         # model
         self._init_model()
@@ -76,9 +115,19 @@ class MBCModel(ABC):
             self._log_res.write(msg)
         print(msg)
 
-    def __del__(self):
-        if hasattr(self, '_files_open') and self._files_open:
-            self._close_files()
+    def close(self):
+        """Release the log file handles and the native Gurobi model. Safe to
+        call more than once; also invoked when the model is used as a context
+        manager."""
+        self._close_files()
+        if hasattr(self, 'm'):
+            self.m.dispose()
+
+    def __enter__(self) -> MBCModel:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     def _open_files(self, dir_logs: str):
         model_graph_name = self.name() + '_' + self.g_name
@@ -88,19 +137,32 @@ class MBCModel(ABC):
         self._files_open = True
 
     def _close_files(self):
+        if not getattr(self, '_files_open', False):
+            return
         self._log_grb.close()
         self._log_res.close()
+        self._files_open = False
 
     def _set_parameters(self):
         if self._time_limit is not None:
             self.m.Params.TimeLimit = self._time_limit
+        if self._threads is not None:
+            self.m.Params.Threads = self._threads
+        if self._method is not None:
+            self.m.Params.Method = self._method
+        if self._mip_focus is not None:
+            self.m.Params.MIPFocus = self._mip_focus
+        if self._presolve is not None:
+            self.m.Params.Presolve = self._presolve
         if not self._log_to_console:
             self.m.Params.LogToConsole = 0
         if self._logging:
             self.m.Params.LogFile = self._log_grb.name
 
     def _init_model(self):
-        self.m = gp.Model()
+        # the environment is shared with the bound helpers in bc_bounds, so a
+        # run computing bounds and solving models starts Gurobi exactly once
+        self.m = gp.Model(env=get_grb_env())
         self._add_variables()
         self._set_objective()
         self._add_constraints()
@@ -112,7 +174,7 @@ class MBCModel(ABC):
 
     @abstractmethod
     def _add_variables(self):
-        self.z = self.m.addVars(self.bicliques, vtype=GRB.CONTINUOUS, lb=0.0, ub=1.0, name="z")
+        self.z = self.m.addMVar(self.upper_bound, vtype=GRB.CONTINUOUS, lb=0.0, ub=1.0, name="z")
 
     @abstractmethod
     def _add_constraints(self):
@@ -139,8 +201,11 @@ class MBCModel(ABC):
         if not self._logging:
             return
         if self.m.status == GRB.OPTIMAL:
-            # check solution
-            self._log_message(f'Is it a biclique cover? {"Yes" if self._check_biclique_cover() else "No"}.\n')
+            # verifying the cover re-walks every biclique and edge, so only do it on demand
+            if self._verify_solution:
+                self._log_message(f'Is it a biclique cover? {"Yes" if self._check_biclique_cover() else "No"}.\n')
+            else:
+                self._log_message('Optimal solution found (not verified).\n')
         elif self.m.status == GRB.TIME_LIMIT:
             self._log_message(f'Model reached time limit of {self._time_limit} seconds.\n')
         elif self.m.status == GRB.INFEASIBLE:
@@ -150,74 +215,208 @@ class MBCModel(ABC):
         if self._logging:
             self._close_files()
 
-    @property
-    @cache
+    def _shared_derivative(self, key: str, compute: Callable):
+        per_graph = _graph_derivatives.setdefault(self.g, {})
+        if key not in per_graph:
+            per_graph[key] = compute()
+        return per_graph[key]
+
+    @cached_property
     def directed(self) -> nx.DiGraph:
-        return nx.DiGraph(self.g)
+        return self._shared_derivative('directed', lambda: nx.DiGraph(self.g))
+
+    def _non_adjacency(self) -> np.ndarray:
+        non_adj = ~self.adjacency.toarray()
+        np.fill_diagonal(non_adj, False)
+        return non_adj
 
     @cached_property
     def complement(self) -> nx.Graph:
-        return nx.complement(self.g)
+        return self._shared_derivative('complement', self._compute_complement)
+
+    def _compute_complement(self) -> nx.Graph:
+        # one vectorized nonzero() instead of nx.complement's O(n^2) Python edge iterator
+        nodes = self.node_list
+        gc = nx.Graph()
+        gc.add_nodes_from(nodes)
+        rows, cols = np.nonzero(np.triu(self._non_adjacency(), k=1))
+        gc.add_edges_from((nodes[u], nodes[v]) for u, v in zip(rows.tolist(), cols.tolist()))
+        return gc
 
     @cached_property
-    def directed_complement(self) -> nx.Graph:
-        return nx.complement(self.directed)
+    def directed_complement(self) -> nx.DiGraph:
+        # the graph is undirected, so its directed complement is just the
+        # undirected complement with every edge taken in both directions
+        return self._shared_derivative('directed_complement', lambda: nx.DiGraph(self.complement))
 
     @cached_property
     def power_graph(self) -> nx.Graph:
-        return nx.power(self.g, k=2)
+        return self._shared_derivative('power_graph', self._compute_power_graph)
+
+    def _compute_power_graph(self) -> nx.Graph:
+        # distance-two adjacency is A or A@A on the boolean matrix; the sparse
+        # matmul runs in C instead of nx.power's per-node Python BFS
+        nodes = self.node_list
+        adj = self.adjacency
+        two_hop = sparse.triu(adj @ adj + adj, k=1).tocoo()
+        g2 = nx.Graph()
+        g2.add_nodes_from(nodes)
+        g2.add_edges_from((nodes[u], nodes[v]) for u, v in zip(two_hop.row.tolist(), two_hop.col.tolist()))
+        return g2
+
+    @cached_property
+    def complement_edges(self) -> np.ndarray:
+        """(k, 2) int32 array of complement edges as node_list indices — the
+        constraint builders iterate this directly, skipping graph construction."""
+        return self._shared_derivative('complement_edges', lambda: np.stack(
+            np.nonzero(np.triu(self._non_adjacency(), k=1)), axis=1).astype(np.int32))
+
+    @cached_property
+    def distance_two_edges(self) -> np.ndarray:
+        """(k, 2) int32 array of vertex pairs at distance exactly two."""
+        def compute():
+            adj = self.adjacency.toarray()
+            two_hop = (self.adjacency @ self.adjacency).toarray() & ~adj
+            np.fill_diagonal(two_hop, False)
+            return np.stack(np.nonzero(np.triu(two_hop, k=1)), axis=1).astype(np.int32)
+        return self._shared_derivative('distance_two_edges', compute)
+
+    @cached_property
+    def power_complement_edges(self) -> np.ndarray:
+        """(k, 2) int32 array of vertex pairs at distance greater than two."""
+        def compute():
+            adj = self.adjacency.toarray()
+            far = ~((self.adjacency @ self.adjacency).toarray() | adj)
+            np.fill_diagonal(far, False)
+            return np.stack(np.nonzero(np.triu(far, k=1)), axis=1).astype(np.int32)
+        return self._shared_derivative('power_complement_edges', compute)
+
+    def _edge_labels(self, index_pairs: np.ndarray) -> Iterable[tuple]:
+        # translate (k, 2) index arrays back to graph labels
+        nodes = self.node_list
+        for u, v in index_pairs.tolist():
+            yield nodes[u], nodes[v]
 
-    @cache
+    @cached_property
+    def node_list(self) -> list:
+        return list(self.g.nodes)
+
+    @cached_property
+    def edge_list(self) -> list[tuple]:
+        return list(self.g.edges)
+
+    @cached_property
+    def directed_edge_list(self) -> list[tuple]:
+        # materialized once: the extended model walks these arcs for several
+        # constraint families, and each walk of directed.edges pays the
+        # NetworkX edge-view protocol again
+        return list(self.directed.edges)
+
+    @cached_property
+    def edge_array(self) -> np.ndarray:
+        return np.array([(self.node_index[u], self.node_index[v]) for u, v in self.edge_list], dtype=np.int32)
+
+    @cached_property
+    def node_index(self) -> dict:
+        return {v: i for i, v in enumerate(self.node_list)}
+
+    @cached_property
+    def adjacency(self):
+        """Boolean CSR adjacency matrix of the graph, indexed by ``node_index``.
+
+        A single row holds the whole neighborhood of a vertex, so edge tests and
+        neighborhood intersections become vectorized matrix lookups instead of
+        repeated ``has_edge`` dict probes.
+        """
+        return self._shared_derivative(
+            'adjacency',
+            lambda: nx.to_scipy_sparse_array(self.g, nodelist=self.node_list, format='csr', dtype=bool))
+
+    @cached_property
     def get_lb_and_indep_edges(self) -> tuple[int, list[tuple[int, int]]]:
         lb, edges = compute_lb_and_get_edges_by_independent_edges_method(g=self.g)
         return int(lb), edges
 
-    @cache
+    @cached_property
     def get_ub_and_vertex_cover(self) -> tuple[int, list[int]]:
         t, ub = get_vertex_cover_solution(g=self.g)
         return int(ub), t
 
-    @cache
+    @cached_property
     def lower_bound(self) -> int:
         if self._lb_method == LBComputeMethod.INDEPENDENT_EDGES:
-            lb, _ = self.get_lb_and_indep_edges()
+            lb, _ = self.get_lb_and_indep_edges
             return lb
         else:
             return int(find_bc_lower_bound(self.g, self._lb_method)) if self._lb_method else 1
 
-    @cache
+    @cached_property
     def upper_bound(self) -> int:
         if self._ub_method == UBComputeMethod.VERTEX:
-            ub, _ = self.get_ub_and_vertex_cover()
+            ub, _ = self.get_ub_and_vertex_cover
             return ub
         else:
             return int(find_bc_upper_bound(self.g, self._ub_method)) if self._ub_method else self.g.edges
 
     @property
     def bicliques(self) -> Iterable:
-        return range(self.upper_bound())
-
-    @cache
-    def get_disjoint_edges(self) -> set[tuple[int, int, int, int]]:
-        disjoint_edges = set()
-        for e, f in combinations(self.g.edges, r=2):
-            a, b = e
-            c, d = f
-            if {a, b}.isdisjoint({c, d}):
-                cr1, cr2 = 0, 0
-                if self.g.has_edge(a, d):
-                    cr1 += 1
-                if self.g.has_edge(c, b):
-                    cr1 += 1
-                if self.g.has_edge(a, c):
-                    cr2 += 1
-                if self.g.has_edge(b, d):
-                    cr2 += 1
-                disjoint_edges.add((e, f, cr1, cr2))
-        return disjoint_edges
+        return range(self.upper_bound)
+
+    @cached_property
+    def get_disjoint_edges(self) -> np.ndarray:
+        """Structured array (_DISJOINT_EDGE_DTYPE) with one row per disjoint edge
+        pair ((a, b), (c, d)) — endpoints as node_list indices — and the crossing
+        counts cr1, cr2. A flat array instead of a set of nested tuples: rows cost
+        a few bytes each and downstream iteration is pointer-free."""
+        return self._shared_derivative('disjoint_edges', self._compute_disjoint_edges)
+
+    def _compute_disjoint_edges(self) -> np.ndarray:
+        edges = self.edge_list
+        n_edges = len(edges)
+        adj = self.adjacency
+        edge_arr = self.edge_array
+        blocks = []
+        # enumerate unordered pairs of distinct edges in row blocks so peak memory
+        # stays bounded at O(_DISJOINT_EDGE_PAIR_CHUNK) instead of O(|E|^2)
+        rows_per_block = max(1, _DISJOINT_EDGE_PAIR_CHUNK // max(n_edges, 1))
+        for start in range(0, n_edges - 1, rows_per_block):
+            stop = min(start + rows_per_block, n_edges - 1)
+            # triangular pair indices (i < j) for this row block, built
+            # arithmetically rather than from an O(rows x |E|) comparison mask
+            rows = np.arange(start, stop)
+            row_counts = n_edges - 1 - rows
+            offsets = np.concatenate(([0], np.cumsum(row_counts)[:-1]))
+            i = np.repeat(rows, row_counts)
+            j = np.arange(row_counts.sum()) + np.repeat(rows + 1 - offsets, row_counts)
+            a, b = edge_arr[i].T
+            c, d = edge_arr[j].T
+            disjoint = (a != c) & (a != d) & (b != c) & (b != d)
+            if not disjoint.any():
+                continue
+            i, j = i[disjoint], j[disjoint]
+            a, b, c, d = a[disjoint], b[disjoint], c[disjoint], d[disjoint]
+            # crossing counts via one stacked adjacency gather instead of per-pair has_edge calls
+            crossings = adj[np.concatenate((a, c, a, b)), np.concatenate((d, b, c, d))] \
+                .astype(np.int8).reshape(4, -1)
+            cr1 = crossings[0] + crossings[1]
+            cr2 = crossings[2] + crossings[3]
+            block = np.empty(i.size, dtype=_DISJOINT_EDGE_DTYPE)
+            block['a'], block['b'] = a, b
+            block['c'], block['d'] = c, d
+            block['cr1'], block['cr2'] = cr1, cr2
+            blocks.append(block)
+        if not blocks:
+            return np.empty(0, dtype=_DISJOINT_EDGE_DTYPE)
+        return np.concatenate(blocks)
+
+    def _disjoint_edge_rows(self) -> Iterable[tuple]:
+        # pool rows with node indices translated back to graph labels
+        nodes = self.node_list
+        for a, b, c, d, cr1, cr2 in self.get_disjoint_edges.tolist():
+            yield nodes[a], nodes[b], nodes[c], nodes[d], cr1, cr2
 
     def _can_add_indep_edges_constraints(self) -> bool:
-        _, indep_edges = self.get_lb_and_indep_edges()
+        _, indep_edges = self.get_lb_and_indep_edges
         return bool(indep_edges) and self._edge_fix and not self._warm_start
 
     def infeasible_or_unsolved(self) -> bool:
@@ -234,7 +433,9 @@ class MBCModel(ABC):
         else:
             self.m.optimize()
         self._solved = True
-        self.m.write("out.lp")
+        # LP serialization is expensive on large models; only write when asked to
+        if self._write_model:
+            self.m.write(f'{self.name()}_{self.g_name}.lp')
         # custom post-solve with default implementation
         self._post_solve()
         # return obj val
@@ -1,14 +1,42 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum, auto
 from itertools import combinations
+from os import cpu_count, environ
 from time import time
+from weakref import WeakKeyDictionary
 
 import gurobipy as gp
 from gurobipy import GRB
 import networkx as nx
 import numpy as np
 import cvxpy as cp
+from scipy import sparse
 
-from src.util import get_graphs_in_store, GraphReport
+from src.util import get_graphs_in_store, chronometer, GraphReport
+
+# cap on the pair-array size materialized per block while scanning edge pairs
+# for the (9c) crossing constraints
+_CROSSING_PAIR_CHUNK = 4_000_000
+
+
+# complement graphs and adjacency matrices shared across repeated bound
+# computations on the same graph object (e.g. the report loop below runs every
+# method on each graph); entries die with the graph
+_graph_complements: WeakKeyDictionary = WeakKeyDictionary()
+_graph_adjacencies: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def _complement(g: nx.Graph) -> nx.Graph:
+    if g not in _graph_complements:
+        _graph_complements[g] = nx.complement(g)
+    return _graph_complements[g]
+
+
+def _adjacency(g: nx.Graph):
+    if g not in _graph_adjacencies:
+        _graph_adjacencies[g] = nx.adjacency_matrix(g)
+    return _graph_adjacencies[g]
 
 
 class LBComputeMethod(str, Enum):
@@ -25,87 +53,239 @@ class UBComputeMethod(str, Enum):
     MERGE_STARS = 'merge_stars'
 
 
+# single Gurobi environment shared by every model built in this process, so
+# repeated bound computations skip the license check and environment startup
+_grb_env: gp.Env = None
+
+
+def get_grb_env() -> gp.Env:
+    global _grb_env
+    if _grb_env is None:
+        _grb_env = gp.Env()
+    return _grb_env
+
+
+def _configure_gurobi(m: gp.Model, time_limit: int = None, memory_limit: int = None):
+    """Shared parameter setup for the small helper MIPs in this module: quiet
+    logs, the cheaper presolve level and dual simplex at the root, which fit
+    these covering/packing formulations better than the defaults. The thread
+    count can be capped through the MBC_THREADS environment variable so batch
+    runs do not oversubscribe cores."""
+    m.Params.LogToConsole = 0
+    m.Params.Threads = int(environ.get('MBC_THREADS', '0'))
+    m.Params.Presolve = 1
+    m.Params.Method = 1
+    m.Params.MIPFocus = 1
+    if time_limit:
+        m.Params.TimeLimit = time_limit
+    if memory_limit:
+        m.Params.SoftMemLimit = memory_limit
+
+
+def _degeneracy_order(masks: list[int], all_bits: int) -> list[int]:
+    """Degeneracy ordering of the graph given by adjacency bitmasks: repeatedly
+    remove a vertex of minimum degree among the remaining ones."""
+    order = []
+    remaining = all_bits
+    while remaining:
+        best, best_deg = -1, len(masks) + 1
+        candidates = remaining
+        while candidates:
+            low = candidates & -candidates
+            candidates ^= low
+            i = low.bit_length() - 1
+            deg = (masks[i] & remaining).bit_count()
+            if deg < best_deg:
+                best, best_deg = i, deg
+        order.append(best)
+        remaining ^= 1 << best
+    return order
+
+
 def count_cliques(g: nx.Graph, timeout: int = None, size_limit: int = None, verification_interval: int = 1000) -> int:
+    """Count the maximal cliques of the complement of g (i.e. its maximal
+    independent sets) with a Bron-Kerbosch search with pivoting over int
+    bitmasks, instead of iterating nx.find_cliques on a materialized complement
+    graph. Set intersections become single big-int ANDs and the timeout/size
+    checks sit directly in the traversal loop."""
+    nodes = list(g.nodes)
+    n = len(nodes)
+    if n == 0:
+        return 0
+    all_bits = (1 << n) - 1
+    nbits = _neighborhood_bitmasks(g, nodes)
+    # complement adjacency: every vertex except self and the g-neighbors
+    comp = [all_bits & ~(nbits[v] | (1 << i)) for i, v in enumerate(nodes)]
     clique_count = 0
     start_time = time()
-    for _ in nx.find_cliques(nx.complement(g)):
-        if clique_count % verification_interval == 0:
-            if timeout and time() - start_time >= timeout:
-                return clique_count
-            if size_limit and clique_count >= size_limit:
-                return clique_count
-        clique_count += 1
+    frames = 0
+    # seed one frame per vertex along a degeneracy ordering of the complement
+    # (Eppstein-Loeffler-Strash): each top-level branch then only recurses into
+    # later neighbors, keeping candidate sets no larger than the degeneracy
+    # frames hold (candidates P, excluded X); the clique itself is not needed
+    stack = []
+    earlier = 0
+    for i in _degeneracy_order(comp, all_bits):
+        nbr = comp[i]
+        later = all_bits & ~earlier & ~(1 << i)
+        stack.append((nbr & later, nbr & earlier))
+        earlier |= 1 << i
+    while stack:
+        frames += 1
+        if timeout and frames % verification_interval == 0 and time() - start_time >= timeout:
+            return clique_count
+        p, x = stack.pop()
+        if p == 0:
+            if x == 0:
+                clique_count += 1
+                if size_limit and clique_count >= size_limit:
+                    return clique_count
+            continue
+        # pivot on the vertex of P|X whose complement-neighborhood covers most of P
+        best_cover = -1
+        pivot_nbr = 0
+        candidates = p | x
+        while candidates:
+            low = candidates & -candidates
+            candidates ^= low
+            nbr = comp[low.bit_length() - 1]
+            cover = (p & nbr).bit_count()
+            if cover > best_cover:
+                best_cover, pivot_nbr = cover, nbr
+        ext = p & ~pivot_nbr
+        while ext:
+            v_bit = ext & -ext
+            ext ^= v_bit
+            nbr = comp[v_bit.bit_length() - 1]
+            stack.append((p & nbr, x & nbr))
+            p ^= v_bit
+            x |= v_bit
     return clique_count
 
 
+def _matching_number(g: nx.Graph) -> int:
+    """Cardinality of a maximum matching. Bipartite graphs go through scipy's
+    Hopcroft-Karp on the biadjacency matrix, which only returns a match array;
+    the general case falls back to nx.max_weight_matching, which materializes
+    the matching as a Python set of edge tuples just to be counted."""
+    if g.number_of_edges() == 0:
+        return 0
+    if nx.is_bipartite(g):
+        color = nx.bipartite.color(g)
+        nodes = list(g.nodes)
+        rows = [i for i, v in enumerate(nodes) if color[v] == 0]
+        cols = [i for i, v in enumerate(nodes) if color[v] == 1]
+        biadjacency = nx.to_scipy_sparse_array(g, nodelist=nodes, format='csr')[rows][:, cols]
+        match = sparse.csgraph.maximum_bipartite_matching(biadjacency, perm_type='column')
+        return int((match != -1).sum())
+    return len(nx.max_weight_matching(g))
+
+
 def find_bc_lower_bound(g: nx.Graph, method: LBComputeMethod = LBComputeMethod.MATCH,
                         time_limit: int = None, memory_limit: int = None) -> int:
     match method:
         case LBComputeMethod.MATCH:  # good for sparse graph
-            m_len = len(nx.max_weight_matching(g))
+            m_len = _matching_number(g)
             e_len = len(g.edges)
-            return np.ceil(m_len ** 2 / e_len)
+            return math.ceil(m_len ** 2 / e_len)
         case LBComputeMethod.LOVASZ:
-            g_c = nx.complement(g)
-            lov_num = np.round(compute_lovasz_number(g_c))
-            return np.ceil(np.log2(lov_num))
+            g_c = _complement(g)
+            lov_num = round(compute_lovasz_number(g_c))
+            return math.ceil(math.log2(lov_num))
         case LBComputeMethod.CLIQUE:
-            return np.ceil(np.log2(max_clique(g)))
+            return math.ceil(math.log2(max_clique(g, time_limit=time_limit, memory_limit=memory_limit)))
         case LBComputeMethod.INDEPENDENT_EDGES:
             return compute_lb_by_independent_edges_method(g, time_limit=time_limit, memory_limit=memory_limit)
         case LBComputeMethod.MAXIMAL_INDEPENDENT_SET:  # should be good for dense graphs
             number_of_cliques = count_cliques(g, timeout=time_limit, size_limit=int(memory_limit*1e9/4))
-            return np.ceil(np.log2(number_of_cliques))
+            return math.ceil(math.log2(number_of_cliques))
         case _:
             raise ValueError("Unsupported Method")
 
         
+_lovasz_numbers: WeakKeyDictionary = WeakKeyDictionary()
+
+
 def compute_lovasz_number(g: nx.Graph) -> int:
-    a = nx.adjacency_matrix(g)
+    if g in _lovasz_numbers:
+        return _lovasz_numbers[g]
+    a = _adjacency(g)
     n = a.shape[0]
-    c = np.ones((n, n))
-    i = np.identity(n)
     x = cp.Variable(shape=(n, n), symmetric=True)
     # The operator >> denotes matrix inequality.
     constraints = [x >> 0]
-    constraints += [cp.trace(i @ x) == 1]
+    constraints += [cp.trace(x) == 1]
     row_ind, col_ind = a.nonzero()
-    constraints += [x[row_ind[i], col_ind[i]] == 0 for i in range(len(row_ind))]
-    prob = cp.Problem(cp.Maximize(cp.trace(c @ x)), constraints)
+    if len(row_ind):
+        # one vectorized zero constraint over all edge entries instead of a
+        # Python constraint object per entry — the per-entry list dominated
+        # CVXPY's canonicalization time
+        constraints += [x[row_ind, col_ind] == 0]
+    # tr(J X) is just the sum of the entries, no need for a dense product
+    prob = cp.Problem(cp.Maximize(cp.sum(x)), constraints)
     prob.solve()
 
 #    # Print result.
     print("The optimal value is", prob.value)
 #    print("A solution X is")
 #    print(X.value)
+    _lovasz_numbers[g] = prob.value
     return prob.value
 
 
-def max_clique(g: nx.Graph) -> int:
-    try:
-        # define model
-        m = gp.Model()
-        # define vars
-        x = m.addVars(g.nodes, vtype=GRB.BINARY, name="x")
-        # define objective function
-        m.setObjective(gp.quicksum(x), sense=GRB.MAXIMIZE)
-        gc = nx.complement(g)
-        # add covering constraints
-        m.addConstrs(x[u] + x[v] <= 1 for u, v in gc.edges)
-        # set a one-minute time limit
-        m.Params.TimeLimit = 60
-        # optimize
-        m.optimize()
-
-        if m.status != GRB.INFEASIBLE:
-            return m.objVal
-        else:
-            print("There is an error in the maximum clique problem!")
-
-    except gp.GurobiError as e:
-        print('Error code ' + str(e.errno) + ': ' + str(e))
-    except AttributeError:
-        print('Encountered an attribute error')
+def _max_clique_bitset(masks: list[int], deadline: float = None) -> int:
+    """Exact maximum clique by branch and bound over bitmask adjacency.
+    Candidates are greedily colored and visited in reverse color order, so a
+    branch is pruned as soon as clique size + color bound cannot beat the
+    incumbent (Tomita-style). Returns the incumbent if the deadline passes."""
+    best = 0
+
+    def expand(size: int, p: int):
+        nonlocal best
+        # greedy coloring of the candidate set: the class number of a vertex
+        # bounds the largest clique extending through it
+        order, bounds = [], []
+        color = 0
+        uncolored = p
+        while uncolored:
+            color += 1
+            available = uncolored
+            while available:
+                v_bit = available & -available
+                available &= ~masks[v_bit.bit_length() - 1] & ~v_bit
+                uncolored ^= v_bit
+                order.append(v_bit)
+                bounds.append(color)
+        for i in range(len(order) - 1, -1, -1):
+            if deadline is not None and time() >= deadline:
+                return
+            if size + bounds[i] <= best:
+                return
+            v_bit = order[i]
+            p ^= v_bit
+            if size + 1 > best:
+                best = size + 1
+            new_p = p & masks[v_bit.bit_length() - 1]
+            if new_p:
+                expand(size + 1, new_p)
+
+    if masks:
+        expand(0, (1 << len(masks)) - 1)
+    return best
+
+
+def max_clique(g: nx.Graph, time_limit: int = None, memory_limit: int = None) -> int:
+    """Size of a maximum clique of g, computed with a combinatorial branch and
+    bound on bitmask adjacency instead of the previous independent-set MIP on
+    the complement graph — no complement materialization and no per-call
+    Gurobi model. Falls back to the incumbent when the time limit expires."""
+    nodes = list(g.nodes)
+    if not nodes:
+        return 0
+    nbits = _neighborhood_bitmasks(g, nodes)
+    masks = [nbits[v] for v in nodes]
+    deadline = time() + (time_limit if time_limit is not None else 60)
+    return _max_clique_bitset(masks, deadline=deadline)
 
 
 def compute_lb_by_independent_edges_method(g: nx.Graph, time_limit: int = None, memory_limit: int = None) -> int:
@@ -115,27 +295,50 @@ def compute_lb_by_independent_edges_method(g: nx.Graph, time_limit: int = None,
 
 def compute_lb_and_get_edges_by_independent_edges_method(
         g: nx.Graph, time_limit: int = None, memory_limit: int = None) -> tuple[int, list]:
-    m = gp.Model()
+    m = gp.Model(env=get_grb_env())
     y = m.addVars(g.edges, vtype=GRB.BINARY)
-    # set time limit
-    if time_limit:
-        m.Params.TimeLimit = time_limit
-    if memory_limit:
-        m.Params.SoftMemLimit = memory_limit
+    # set params
+    _configure_gurobi(m, time_limit=time_limit, memory_limit=memory_limit)
     # objective function
     m.setObjective(gp.quicksum(y[e] for e in g.edges), GRB.MAXIMIZE)
     # constraints
-    for v in g.nodes:
-        for e in g.edges(v):
-            try:
-                m.addConstr(y[e] <= 1, name=f'(9b) for ({e[0]}, {e[1]}) from v={v}')
-            except KeyError:
-                m.addConstr(y[e[1], e[0]] <= 1, name=f'(9b) for ({e[1]}, {e[0]}) from v={v}')
-    for e1, e2 in combinations(g.edges, r=2):
-        a, b = e1
-        c, d = e2
-        if (g.has_edge(a, d) and g.has_edge(b, c)) or (g.has_edge(a, c) and g.has_edge(b, d)):
-            m.addConstr(y[a, b] + y[c, d] <= 1, name=f'(9c) for ({a}, {b}) and ({c}, {d})')
+    # (9b) added one y[e] <= 1 row per edge adjacency here, but y is binary so
+    # the bound already holds, and pairs of edges sharing a vertex are always
+    # crossing pairs, so (9c) below covers them; the rows only bloated presolve
+    # find the crossing edge pairs for (9c) with one vectorized adjacency gather
+    # over all pairs instead of four has_edge calls per pair
+    edges = list(g.edges)
+    if len(edges) > 1:
+        nodes = list(g.nodes)
+        index = {v: i for i, v in enumerate(nodes)}
+        adj = nx.to_scipy_sparse_array(g, nodelist=nodes, format='csr', dtype=bool)
+        edge_arr = np.array([(index[u], index[v]) for u, v in edges], dtype=np.int32)
+        n_edges = len(edges)
+        # enumerate unordered edge pairs in row blocks so peak memory stays
+        # bounded at O(_CROSSING_PAIR_CHUNK) instead of O(|E|^2)
+        pi_blocks, pj_blocks = [], []
+        rows_per_block = max(1, _CROSSING_PAIR_CHUNK // n_edges)
+        for start in range(0, n_edges - 1, rows_per_block):
+            stop = min(start + rows_per_block, n_edges - 1)
+            rows = np.arange(start, stop)
+            row_counts = n_edges - 1 - rows
+            offsets = np.concatenate(([0], np.cumsum(row_counts)[:-1]))
+            iu = np.repeat(rows, row_counts)
+            ju = np.arange(row_counts.sum()) + np.repeat(rows + 1 - offsets, row_counts)
+            a, b = edge_arr[iu].T
+            c, d = edge_arr[ju].T
+            crossing = (adj[a, d] & adj[b, c]) | (adj[a, c] & adj[b, d])
+            pi_blocks.append(iu[crossing])
+            pj_blocks.append(ju[crossing])
+        pi = np.concatenate(pi_blocks)
+        pj = np.concatenate(pj_blocks)
+        if len(pi) > 0:
+            # one matrix constraint for all (9c) rows instead of a Python loop
+            rows = np.repeat(np.arange(len(pi)), 2)
+            cols = np.column_stack((pi, pj)).ravel()
+            pair_incidence = sparse.csr_array(
+                (np.ones(len(cols)), (rows, cols)), shape=(len(pi), len(edges)))
+            m.addMConstr(pair_incidence, [y[e] for e in edges], GRB.LESS_EQUAL, np.ones(len(pi)))
     # solve model
     m.optimize()
     # return values
@@ -151,7 +354,7 @@ def find_bc_upper_bound(g: nx.Graph, method: UBComputeMethod = UBComputeMethod.N
     match method:
         case UBComputeMethod.NUMBER:
             n = len(g.nodes)
-            return n + 1 - np.floor(np.log2(n))
+            return n + 1 - (n.bit_length() - 1)
         case UBComputeMethod.VERTEX:
             return vertex_cover(g, time_limit=time_limit, memory_limit=memory_limit)
         case UBComputeMethod.MERGE_STARS:
@@ -161,30 +364,49 @@ def find_bc_upper_bound(g: nx.Graph, method: UBComputeMethod = UBComputeMethod.N
             raise ValueError("Unsupported Method")
 
 
+# vertex-cover solutions shared per graph object: the VERTEX upper bound and
+# merge_stars both need the same cover, and the MIP should only be solved once
+_vertex_cover_solutions: WeakKeyDictionary = WeakKeyDictionary()
+
+
 def get_vertex_cover_solution(g: nx.Graph, time_limit: int = None, memory_limit: int = None) -> tuple[list, int]:
+    if g in _vertex_cover_solutions:
+        return _vertex_cover_solutions[g]
     try:
         # define model
-        m = gp.Model()
+        m = gp.Model(env=get_grb_env())
         # set params
-        m.Params.LogToConsole = 0
-        if time_limit:
-            m.Params.TimeLimit = time_limit
-        if memory_limit:
-            m.Params.SoftMemLimit = memory_limit
+        _configure_gurobi(m, time_limit=time_limit, memory_limit=memory_limit)
+        nodes = list(g.nodes)
+        index = {v: i for i, v in enumerate(nodes)}
+        edges = list(g.edges)
         # define vars
-        x = m.addVars(g.nodes, vtype=GRB.BINARY, name="x")
+        x = m.addMVar(len(nodes), vtype=GRB.BINARY, name="x")
         # define objective function
-        m.setObjective(gp.quicksum(x), sense=GRB.MINIMIZE)
-        # add covering constraints
-        m.addConstrs(x[u] + x[v] >= 1 for u, v in g.edges)
-        # set a one-minute time limit
-        m.Params.TimeLimit = 60
+        m.setObjective(x.sum(), sense=GRB.MINIMIZE)
+        # add the covering constraints as one sparse incidence matrix,
+        # a single C-side call instead of one addConstr per edge
+        if edges:
+            rows = np.repeat(np.arange(len(edges)), 2)
+            cols = np.array([(index[u], index[v]) for u, v in edges], dtype=np.int32).ravel()
+            incidence = sparse.csr_matrix(
+                (np.ones(2 * len(edges)), (rows, cols)), shape=(len(edges), len(nodes)))
+            m.addMConstr(incidence, x, GRB.GREATER_EQUAL, np.ones(len(edges)))
+        # warm-start from the greedy 2-approximation so the solver begins
+        # branch and bound with an incumbent instead of discovering one
+        greedy = nx.approximation.min_weighted_vertex_cover(g)
+        x.Start = np.array([1.0 if v in greedy else 0.0 for v in nodes])
+        # fall back to a one-minute time limit when the caller did not set one
+        if time_limit is None:
+            m.Params.TimeLimit = 60
         # optimize
         m.optimize()
 
         if m.status != GRB.INFEASIBLE:
-            t = [vertex for vertex in g.nodes if x[vertex].X > 0.5]
-            return t, m.objVal
+            x_val = x.X
+            t = [vertex for i, vertex in enumerate(nodes) if x_val[i] > 0.5]
+            _vertex_cover_solutions[g] = (t, m.objVal)
+            return _vertex_cover_solutions[g]
         else:
             print("There is an error in the vertex cover problem!")
 
@@ -199,51 +421,86 @@ def vertex_cover(g: nx.Graph, time_limit: int = None, memory_limit: int = None)
     return val
 
 
+def _neighborhood_bitmasks(g: nx.Graph, nodes: list) -> dict:
+    """One int bitmask per vertex encoding its neighborhood, with bit i standing
+    for nodes[i]. Subset tests and common-neighbor scans on the masks are single
+    big-int operations instead of hash-set walks."""
+    index = {v: i for i, v in enumerate(nodes)}
+    masks = {v: 0 for v in nodes}
+    for u, w in g.edges:
+        masks[u] |= 1 << index[w]
+        masks[w] |= 1 << index[u]
+    return masks
+
+
+def _bitmask_members(mask: int, nodes: list):
+    while mask:
+        low = mask & -mask
+        yield nodes[low.bit_length() - 1]
+        mask &= mask - 1
+
+
 def merge_stars(g: nx.Graph, t: gp.Model = None) -> list:
     if t is None:
         t, _ = get_vertex_cover_solution(g)
-    g2 = nx.power(g, k=2)
-    for vertex in g2.nodes:
-        g2.nodes[vertex]['cover'] = False
+    nodes = list(g.nodes)
+    nbits = _neighborhood_bitmasks(g, nodes)
+    # pairs at distance exactly two via one sparse boolean matmul, instead of
+    # nx.power building a whole Python graph of all pairs at distance <= 2
+    adj = nx.to_scipy_sparse_array(g, nodelist=nodes, format='csr', dtype=bool).toarray()
+    two_hop = (adj @ adj) & ~adj
+    np.fill_diagonal(two_hop, False)
+    cover = {vertex: False for vertex in nodes}
     for vertex in t:
-        g2.nodes[vertex]['cover'] = True
+        cover[vertex] = True
     biclique_cover = []
-    for u, v in g2.edges:
-        if g.has_edge(u, v):
+    for u_idx, v_idx in zip(*np.nonzero(np.triu(two_hop, k=1))):
+        u, v = nodes[u_idx], nodes[v_idx]
+        if not cover[u] or not cover[v]:
             continue
-        if not g2.nodes[u]['cover'] or not g2.nodes[v]['cover']:
-            continue
-        u_neighbor_set = set(g.neighbors(u))
-        v_neighbor_set = set(g.neighbors(v))
-        if u_neighbor_set.issubset(v_neighbor_set):
-            biclique_cover.append(set(g.edges(u)) | {(q, v) for q in nx.common_neighbors(g, u, v)})
-            g2.nodes[u]['cover'] = False
-        if v_neighbor_set.issubset(u_neighbor_set):
-            biclique_cover.append(set(g.edges(v)) | {(q, u) for q in nx.common_neighbors(g, u, v)})
-            g2.nodes[v]['cover'] = False
-    for vertex in g2.nodes:
-        if not g2.nodes[vertex]['cover']:
+        common = nbits[u] & nbits[v]
+        # N(u) is a subset of N(v) iff u has no neighbor outside N(v)
+        if nbits[u] & ~nbits[v] == 0:
+            biclique_cover.append(set(g.edges(u)) | {(q, v) for q in _bitmask_members(common, nodes)})
+            cover[u] = False
+        if nbits[v] & ~nbits[u] == 0:
+            biclique_cover.append(set(g.edges(v)) | {(q, u) for q in _bitmask_members(common, nodes)})
+            cover[v] = False
+    for vertex in nodes:
+        if not cover[vertex]:
             continue
         biclique_cover.append(set(g.edges(vertex)))
     return biclique_cover
 
 
+def _run_lb_methods(args: tuple) -> list[tuple]:
+    # one task per graph: running every method in the same worker lets them
+    # share the memoized per-graph derivatives (complement, adjacency) instead
+    # of each method re-deriving them in a different process
+    g, methods, time_limit, memory_limit = args
+    return [chronometer(f=find_bc_lower_bound, g=g, method=method,
+                        time_limit=time_limit, memory_limit=memory_limit)
+            for method in methods]
+
+
 if __name__ == "__main__":
     model_time_limit = None
     model_memory_limit = 4
+    # LOVASZ is too slow for a small number of edges
+    methods = [method for method in LBComputeMethod if method != LBComputeMethod.LOVASZ]
     report = GraphReport('bounds')
-    report.add_properties([str(method) for method in LBComputeMethod if method != LBComputeMethod.LOVASZ])
+    report.add_properties([str(method) for method in methods])
     # report.add_properties([str(method) for method in UBComputeMethod])
-    # iterate graphs
-    for g, g_name in get_graphs_in_store(recursive=False):
+    # graphs are independent, so spread them over worker processes instead of
+    # holding a single core through the whole sweep
+    graphs = list(get_graphs_in_store(recursive=False))
+    tasks = [(g, methods, model_time_limit, model_memory_limit) for g, _ in graphs]
+    with ProcessPoolExecutor(max_workers=max(1, (cpu_count() or 2) // 2)) as pool:
+        results = list(pool.map(_run_lb_methods, tasks))
+    for (g, g_name), graph_results in zip(graphs, results):
         report.add_graph_data(g, g_name)
-        for method in LBComputeMethod:
-            # LOVASZ is too slow for a small number of edges
-            if method == LBComputeMethod.LOVASZ:
-                continue
-            report.add_property_values_from_function(p_name=str(method), f=find_bc_lower_bound, g=g,
-                                                     method=method, time_limit=model_time_limit,
-                                                     memory_limit=model_memory_limit)
+        for method, (value, elapsed) in zip(methods, graph_results):
+            report.add_property_values(p_name=str(method), p_value=value, p_time=elapsed)
         # for method in UBComputeMethod:
         #     report.add_property_values_from_function(p_name=str(method), f=find_bc_upper_bound, g=g,
         #                                              method=method, time_limit=model_time_limit,
@@ -1,354 +1,564 @@
-import gurobipy as gp
-from gurobipy import GRB
-
-import time
-
-import networkx as nx
-from itertools import combinations
-
-import heuristic
-import vertex_cover
-
-
-def get_v_bicliques(G, X, k):
-    bicliques = []
-    for b in range(k):
-        A = []
-        B = []
-        for u in G.nodes:
-            if X[u, b, 0].x > 0.5:
-                A.append(u)
-            if X[u, b, 1].x > 0.5:
-                B.append(u)
-        if A != [] and B != []:
-            bicliques.append((A, B))
-    return bicliques
-
-
-def get_vertex_bc_from_edge(G, edge_set):
-    node_set = []
-    for b in range(len(edge_set)):
-        # Initialize two disjoint sets.
-        A, B = [], []
-        d = {}
-        for u, v in edge_set[b]:
-            d[(u, v)] = 1
-            A = [u]
-        if len(A) == 0:
-            continue
-        # If there is an edge between v and A[0], then v must be in B.
-        for v in G.neighbors(A[0]):
-            if ((A[0], v) in d) or ((v, A[0]) in d):
-                B.append(v)
-        if len(B) == 0:
-            continue
-        A = []
-        for u in G.neighbors(B[0]):
-            if ((B[0], u) in d) or ((u, B[0]) in d):
-                A.append(u)
-        node_set.append((A, B))
-    return node_set
-
-
-# Get biclique covers from the formulations with edge.
-def get_v_bicliques_from_e(G, Y, k):
-    bcs = []
-    for b in range(k):
-        # Initialize two disjoint sets.
-        A, B = [], []
-        d = {}
-        for u, v in G.edges:
-            if Y[u, v, b].x > 0.5:
-                d[(u, v)] = 1
-                A = [u]
-        if len(A) == 0:
-            continue
-        # If there is an edge between v and A[0], then v must be in B.
-        for v in G.neighbors(A[0]):
-            if ((A[0], v) in d) or ((v, A[0]) in d):
-                B.append(v)
-        if len(B) == 0:
-            continue
-        A = []
-        for u in G.neighbors(B[0]):
-            if ((B[0], u) in d) or ((u, B[0]) in d):
-                A.append(u)
-        bcs.append((A, B))
-    return bcs
-
-
-# Each biclique is written as two disjoint set of nodes.
-# Check whether it is a biclique cover.
-def check_v_biclique_cover(G, bcs):
-    for u, v in G.edges:
-        G.edges[u, v]["visited"] = False
-    for bc in bcs:
-        A, B = bc[0], bc[1]
-        for u in A:
-            for v in B:
-                if u == v:
-                    return False
-                if G.has_edge(u, v):
-                    G.edges[u, v]["visited"] = True
-                elif G.has_edge(v, u):
-                    G.edges[v, u]["visited"] = True
-                else:
-                    return False
-    for u, v in G.edges:
-        if not G.edges[u, v]["visited"]:
-            return False
-    return True
-
-
-def build_bottom_up_model_v(G, k, indep_edges, maximal_con):
-    # define model
-    m = gp.Model()
-    # set a one-minute time limit
-    m.Params.TimeLimit = 300
-    # m.Params.Cuts = 0
-    DG = G.to_directed()
-    print("k: ", k)
-    # define vars
-    Z = m.addVars(range(k), vtype=GRB.BINARY, name="z")
-    X = m.addVars(G.nodes, range(k), range(2), vtype=GRB.BINARY, name="x")
-    Y = m.addVars(DG.edges, range(k), lb=0.0, ub=1.0, vtype=GRB.CONTINUOUS, name="y")
-    if maximal_con:
-        add_maximal_con_v(m, G, DG, Y, k)
-    # fix z vars
-    for b in range(k):
-        Z[b].lb = 1
-    fix_indep_edges_v(indep_edges, X, Y)
-    # define objective function
-    m.setObjective(gp.quicksum(Z), sense=GRB.MINIMIZE)
-    # symmetry-break constraints
-    m.addConstrs(Z[b] >= Z[b + 1] for b in range(k - 1))
-    add_base_constr_v(m, G, DG, X, Y, Z, k)
-    return m, X
-
-
-def solve_recursive(G, indep_edges=None, maximal_con=True):
-    if indep_edges is None:
-        indep_edges = []
-    # no_solution = True
-    start = time.time()
-    k = len(indep_edges)
-    while True:
-        m, X = build_bottom_up_model_v(G, k, indep_edges, maximal_con)
-        m.optimize()
-
-        if m.status == GRB.OPTIMAL:
-            print("Total time: ", time.time() - start)
-            return m.objVal, get_v_bicliques(G, X, k)
-        else:
-            k += 1
-
-
-def find_heuristic_solution(g: nx.Graph):
-    vertex_cover_number, vertex_cover_set = vertex_cover.solve(g)
-    return heuristic.find_cover(g, vertex_cover_set)
-
-
-def add_maximal_con_v(m, G, DG, Y, k):
-    maximal_cliques = nx.find_cliques(G)
-    for clique in list(maximal_cliques):
-        if len(clique) % 2 == 0:
-            clique_num = len(clique) ** 2 / 4
-        else:
-            clique_num = (len(clique) + 1) * (len(clique) - 1) / 4
-        cliqueConstr = m.addConstrs(
-            gp.quicksum(Y[u, v, b] for u, v in DG.subgraph(clique).edges) <= clique_num for b in range(k))
-        cliqueConstr.Lazy = 2
-
-
-def add_initial_v(heuristic_sol, X, Y, Z):
-    for b, cover in enumerate(heuristic_sol):
-        # print ("b, ", b)
-        Z[b].start = 1
-        for u in cover[0]:
-            X[u, b, 0].start = 1
-        for v in cover[1]:
-            X[v, b, 1].start = 1
-        for u in cover[0]:
-            for v in cover[1]:
-                Y[u, v, b].start = 1.0
-
-
-def fix_indep_edges_v(indep_edges, X, Y):
-    for b, (u, v) in enumerate(indep_edges):
-        X[u, b, 0].lb = 1.0
-        X[v, b, 1].lb = 1.0
-        Y[u, v, b].lb = 1.0
-        Y[v, u, b].ub = 0.0
-    return
-
-
-def add_base_constr_v(m, G, DG, X, Y, Z, k):
-    GC = nx.complement(DG)
-    # coupling constraints
-    m.addConstrs(X[v, b, i] <= Z[b] for v in G.nodes for b in range(k) for i in range(2))
-    # covering constraints
-    m.addConstrs(gp.quicksum(Y[u, v, b] + Y[v, u, b] for b in range(k)) >= 1 for u, v in G.edges)
-    # node assignment constraints
-    m.addConstrs(X[v, b, 0] + X[v, b, 1] <= Z[b] for v in G.nodes for b in range(k))
-    # node and edge constraints
-    for u, v in DG.edges:
-        m.addConstrs(Y[u, v, b] <= X[u, b, 0] for b in range(k))
-        m.addConstrs(Y[u, v, b] <= X[v, b, 1] for b in range(k))
-        m.addConstrs(Y[u, v, b] >= X[u, b, 0] + X[v, b, 1] - Z[b] for b in range(k))
-    for u, v in GC.edges:
-        m.addConstrs(X[u, b, 0] + X[v, b, 1] <= Z[b] for b in range(k))
-    return
-
-
-# Dual version implementation of g
-def solve_v(G, heuristic_sol, indep_edges=None, maximal_con=False):
-    if indep_edges is None:
-        indep_edges = []
-    # define model
-    m = gp.Model()
-    # set a one-minute time limit
-    m.Params.TimeLimit = 300
-    # m.Params.Cuts = 0
-    # maximum number of biclique covers
-    k = len(heuristic_sol)
-    DG = G.to_directed()
-    print("k: ", k)
-    # define vars
-    Z = m.addVars(range(k), vtype=GRB.BINARY, name="z")
-    X = m.addVars(G.nodes, range(k), range(2), vtype=GRB.BINARY, name="x")
-    Y = m.addVars(DG.edges, range(k), lb=0.0, ub=1.0, vtype=GRB.CONTINUOUS, name="y")
-    if maximal_con:
-        add_maximal_con_v(m, G, DG, Y, k)
-    # warm start X vars
-    add_initial_v(heuristic_sol, X, Y, Z)
-    fix_indep_edges_v(indep_edges, X, Y)
-    # define objective function
-    m.setObjective(gp.quicksum(Z), sense=GRB.MINIMIZE)
-    # symmetry-break constraints
-    m.addConstrs(Z[b] >= Z[b + 1] for b in range(k - 1))
-    add_base_constr_v(m, G, DG, X, Y, Z, k)
-    m.optimize()
-    print('Objective: ', m.objVal)
-    return get_v_bicliques(G, X, k)
-
-
-# Return an edge heuristic_solution
-def heuristic_greedy(H):
-    G = H.copy()
-    for u, v in G.edges:
-        G.edges[u, v]["w"] = 1.0
-    DG = G.to_directed()
-    bcs = []
-    while True:
-        m = gp.Model()
-        # set a one-minute time limit
-        m.Params.TimeLimit = 60
-        # define vars
-        X = m.addVars(G.nodes, range(2), vtype=GRB.BINARY, name="x")
-        Y = m.addVars(DG.edges, lb=0.0, ub=1.0, vtype=GRB.CONTINUOUS, name="y")
-        GC = nx.complement(DG)
-
-        # node assignment constraints
-        m.addConstrs(X[v, 0] + X[v, 1] <= 1 for v in G.nodes)
-
-        # node and edge constraints
-        m.addConstrs(Y[u, v] <= X[u, 0] for u, v in DG.edges)
-        m.addConstrs(Y[u, v] <= X[v, 1] for u, v in DG.edges)
-        m.addConstrs(Y[u, v] >= X[u, 0] + X[v, 1] - 1 for u, v in DG.edges)
-
-        m.addConstrs(X[u, 0] + X[v, 1] <= 1 for u, v in GC.edges)
-        m.setObjective(gp.quicksum((Y[u, v] + Y[v, u]) * G.edges[u, v]["w"] for u, v in G.edges), sense=GRB.MAXIMIZE)
-        m.optimize()
-        if m.status == GRB.OPTIMAL or m.status == GRB.TIME_LIMIT:
-            if m.getObjective().getValue() == 0:
-                return bcs
-            bc = [(u, v) for u, v in G.edges if Y[u, v].x + Y[v, u].x > 0.5]
-            for u, v in G.edges:
-                if Y[u, v].x + Y[v, u].x > 0.5:
-                    G.edges[u, v]["w"] = 0.0
-            bcs.append(bc)
-        else:
-            print("Can't get a heuristic sol.")
-            return []
-
-
-def solve(G, heuristic_sol, indep_edges=None):
-    if indep_edges is None:
-        indep_edges = []
-
-    # define model
-    m = gp.Model()
-    # set a one-minute time limit
-    m.Params.TimeLimit = 300
-    # maximum number of biclique covers
-    k = len(heuristic_sol)
-    print("k: ", k)
-    # define vars
-    Z = m.addVars(range(k), vtype=GRB.BINARY, name="z")
-    Y = m.addVars(G.edges, range(k), vtype=GRB.BINARY, name="y")
-    # warm start Y vars
-    for b, cover in enumerate(heuristic_sol):
-        # print ("b, ", b)
-        for (u, v) in cover:
-            # print("(u, v): ", (u,v))
-            Y[u, v, b].start = 1.0
-    # fix z vars
-    for b, (u, v) in enumerate(indep_edges):
-        Z[b].lb = 1
-        Y[u, v, b].lb = 1
-    # define objective function
-    m.setObjective(gp.quicksum(Z), sense=GRB.MINIMIZE)
-    # symmetry-break constraints
-    m.addConstrs(Z[b] >= Z[b + 1] for b in range(k - 1))
-    # coupling constraints
-    m.addConstrs(Y[u, v, b] <= Z[b] for u, v in G.edges for b in range(k))
-    # covering constraints
-    m.addConstrs(gp.quicksum(Y[u, v, b] for b in range(k)) >= 1 for u, v in G.edges)
-    # cycle-3 elimination constraints
-    list_of_C_3 = []
-    for u, v in G.edges:
-        for j in nx.common_neighbors(G, u, v):
-            cycle_list = [(u, v)]
-            cycle_list.append((u, j)) if u < j else cycle_list.append((j, u))
-            cycle_list.append((v, j)) if v < j else cycle_list.append((j, v))
-            if cycle_list not in list_of_C_3:
-                list_of_C_3.append(cycle_list)
-    # print("list of cycles", list_of_C_3)
-    for cycle in list_of_C_3:
-        for b in range(k):
-            cycle_constr = m.addConstr(gp.quicksum(Y[u, v, b] for u, v in cycle) <= 2)
-            cycle_constr.Lazy = 2
-    # edge conflict constraints
-    for pair in combinations(G.edges, 2):
-        pair0 = set(pair[0])
-        pair1 = set(pair[1])
-        intersect = pair0.intersection(pair1)
-        if not intersect:
-            u, v = pair[0]
-            c, d = pair[1]
-            for b in range(k):
-                left_expr = gp.LinExpr(Y[u, v, b] + Y[c, d, b])
-                right_expr = gp.LinExpr()
-                if (c, u) in G.edges and c < u:
-                    right_expr += gp.LinExpr(Y[c, u, b])
-                elif (c, u) in G.edges:
-                    right_expr += gp.LinExpr(Y[u, c, b])
-                if (c, v) in G.edges and c < v:
-                    right_expr += gp.LinExpr(Y[c, v, b])
-                elif (c, v) in G.edges:
-                    right_expr += gp.LinExpr(Y[v, c, b])
-                crossConstr = m.addConstr(left_expr <= 1 + right_expr)
-                crossConstr.Lazy = 2
-                right_expr = gp.LinExpr()
-                if (d, u) in G.edges and d < u:
-                    right_expr += gp.LinExpr(Y[d, u, b])
-                elif (d, u) in G.edges:
-                    right_expr += gp.LinExpr(Y[u, d, b])
-                if (d, v) in G.edges and d < v:
-                    right_expr += gp.LinExpr(Y[d, v, b])
-                elif (d, v) in G.edges:
-                    right_expr += gp.LinExpr(Y[v, d, b])
-                crossConstr = m.addConstr(left_expr <= 1 + right_expr)
-                crossConstr.Lazy = 2
-    m.optimize()
-    return get_v_bicliques_from_e(G, Y, k)
+import gurobipy as gp
+from gurobipy import GRB
+
+from os import environ
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+import numpy as np
+
+import heuristic
+import vertex_cover
+
+
+def directed_edge_arrays(G, DG):
+    # node and directed-edge numbering shared by the MVar tensors below: every
+    # constraint block indexes X/Y through these positions
+    nodes = list(G.nodes)
+    index = {v: i for i, v in enumerate(nodes)}
+    dir_edges = list(DG.edges)
+    us = np.array([index[u] for u, v in dir_edges])
+    vs = np.array([index[v] for u, v in dir_edges])
+    eid = {e: i for i, e in enumerate(dir_edges)}
+    return nodes, index, dir_edges, us, vs, eid
+
+
+def configure_solver(m, threads=None, method=None):
+    # thread count falls back to the MBC_THREADS environment variable also
+    # honored by the bound helpers, so batch runs share one oversubscription
+    # lever; method selects the root relaxation algorithm (2 = barrier)
+    m.Params.Threads = threads if threads is not None else int(environ.get('MBC_THREADS', '0'))
+    if method is not None:
+        m.Params.Method = method
+
+
+def complement_edge_arrays(G, nodes):
+    # directed complement of G as index arrays over the given node order:
+    # flip the dense boolean adjacency and read the nonzeros, instead of
+    # iterating non-edges one tuple at a time in Python
+    a = nx.to_numpy_array(G, nodelist=nodes, dtype=bool)
+    comp = ~a
+    np.fill_diagonal(comp, False)
+    return np.nonzero(comp)
+
+
+def get_v_bicliques(G, X, k):
+    bicliques = []
+    nodes = list(G.nodes)
+    x_val = X.X
+    for b in range(k):
+        A = [u for i, u in enumerate(nodes) if x_val[i, b, 0] > 0.5]
+        B = [u for i, u in enumerate(nodes) if x_val[i, b, 1] > 0.5]
+        if A != [] and B != []:
+            bicliques.append((A, B))
+    return bicliques
+
+
+def biclique_sides_from_edges(selected_edges):
+    # Bucket the selected edges by endpoint in one scan; the two sides are then
+    # direct adjacency-list reads instead of per-neighbor membership tests on
+    # both edge orientations.
+    nbr = {}
+    last = None
+    for u, v in selected_edges:
+        nbr.setdefault(u, []).append(v)
+        nbr.setdefault(v, []).append(u)
+        last = u
+    if last is None:
+        return None
+    # B holds the partners of one endpoint, A the partners of any B node.
+    B = nbr[last]
+    A = nbr[B[0]]
+    return A, B
+
+
+def get_vertex_bc_from_edge(G, edge_set):
+    node_set = []
+    for b in range(len(edge_set)):
+        sides = biclique_sides_from_edges(edge_set[b])
+        if sides is not None:
+            node_set.append(sides)
+    return node_set
+
+
+# Get biclique covers from the formulations with edge.
+def get_v_bicliques_from_e(G, Y, k):
+    bcs = []
+    for b in range(k):
+        sides = biclique_sides_from_edges(
+            (u, v) for u, v in G.edges if Y[u, v, b].x > 0.5)
+        if sides is not None:
+            bcs.append(sides)
+    return bcs
+
+
+# Each biclique is written as two disjoint set of nodes.
+# Check whether it is a biclique cover.
+def check_v_biclique_cover(G, bcs):
+    # mark coverage in a bool array indexed by edge id instead of writing a
+    # 'visited' attribute into the graph for every edge
+    edge_id = {}
+    for i, (u, v) in enumerate(G.edges):
+        edge_id[u, v] = edge_id[v, u] = i
+    covered = np.zeros(G.number_of_edges(), dtype=bool)
+    for bc in bcs:
+        A, B = bc[0], bc[1]
+        for u in A:
+            for v in B:
+                if u == v:
+                    return False
+                i = edge_id.get((u, v))
+                if i is None:
+                    return False
+                covered[i] = True
+    return bool(covered.all())
+
+
+def build_bottom_up_model_v(G, k, indep_edges, maximal_con, heuristic_sol=None, threads=None, method=None):
+    # define model
+    m = gp.Model()
+    # set a one-minute time limit
+    m.Params.TimeLimit = 300
+    # m.Params.Cuts = 0
+    configure_solver(m, threads=threads, method=method)
+    DG = G.to_directed()
+    print("k: ", k)
+    nodes, index, dir_edges, us, vs, eid = directed_edge_arrays(G, DG)
+    # define vars as MVar tensors over the node/edge numbering, so each
+    # constraint block below is one matrix call instead of a Python loop
+    Z = m.addMVar(k, vtype=GRB.BINARY, name="z")
+    X = m.addMVar((len(nodes), k, 2), vtype=GRB.BINARY, name="x")
+    Y = m.addMVar((len(dir_edges), k), lb=0.0, ub=1.0, vtype=GRB.CONTINUOUS, name="y")
+    if maximal_con:
+        add_maximal_con_v(m, G, DG, Y, k)
+    # fix z vars
+    Z.LB = 1
+    # seed the first k bicliques of a known cover as a (partial) MIP start
+    if heuristic_sol:
+        add_initial_v(heuristic_sol[:k], X, Y, Z, index, eid)
+    fix_indep_edges_v(indep_edges, X, Y, index, eid)
+    # define objective function
+    m.setObjective(Z.sum(), sense=GRB.MINIMIZE)
+    # symmetry-break constraints
+    if k > 1:
+        m.addConstr(Z[:-1] >= Z[1:])
+    add_base_constr_v(m, G, DG, X, Y, Z, k)
+    return m, X
+
+
+# Incremental variant of build_bottom_up_model_v for the serial recursion:
+# instead of rebuilding the whole model when k grows by one, keep the model and
+# append only the column of variables and constraints that mention the new b.
+class IncrementalBottomUpModel:
+
+    def __init__(self, G, k, indep_edges, maximal_con, heuristic_sol=None, threads=None, method=None):
+        self.m = gp.Model()
+        self.m.Params.TimeLimit = 300
+        configure_solver(self.m, threads=threads, method=method)
+        self.G = G
+        self.DG = G.to_directed()
+        self.nodes, self.index, self.dir_edges, self.us, self.vs, self.eid = \
+            directed_edge_arrays(G, self.DG)
+        self.uc, self.vc = complement_edge_arrays(G, self.nodes)
+        self.fwd = np.array([self.eid[u, v] for u, v in G.edges], dtype=int)
+        self.rev = np.array([self.eid[v, u] for u, v in G.edges], dtype=int)
+        self.indep_edges = indep_edges
+        self.heuristic_sol = heuristic_sol
+        # clique cuts are computed once; each new column reuses the row arrays
+        self.cliques = list(clique_cut_rows(G, self.DG, self.eid)) if maximal_con else []
+        # covering rows start empty; add_column pushes each column's Y terms in
+        self.m.ModelSense = GRB.MINIMIZE
+        self.cover_constrs = [self.m.addLConstr(gp.LinExpr() >= 1) for _ in range(len(self.fwd))]
+        self.z_vars, self.x_cols, self.y_cols = [], [], []
+        self.k = 0
+        for _ in range(k):
+            self.add_column()
+
+    def add_column(self):
+        m, b = self.m, self.k
+        z = m.addMVar(1, vtype=GRB.BINARY, lb=1, obj=1, name=f"z{b}")
+        x = m.addMVar((len(self.nodes), 2), vtype=GRB.BINARY, name=f"x{b}")
+        y = m.addMVar(len(self.dir_edges), lb=0.0, ub=1.0, vtype=GRB.CONTINUOUS, name=f"y{b}")
+        for rows, clique_num in self.cliques:
+            cliqueConstr = m.addConstr(y[rows].sum() <= clique_num)
+            cliqueConstr.Lazy = 2
+        # constraints of add_base_constr_v that reference column b only
+        m.addConstr(x <= z)
+        m.addConstr(x[:, 0] + x[:, 1] <= z)
+        if len(self.dir_edges) > 0:
+            m.addConstr(y <= x[self.us, 0])
+            m.addConstr(y <= x[self.vs, 1])
+            m.addConstr(y >= x[self.us, 0] + x[self.vs, 1] - z)
+        if len(self.uc) > 0:
+            m.addConstr(x[self.uc, 0] + x[self.vc, 1] <= z)
+        # push the column's Y terms into the existing covering rows
+        y_list = y.tolist()
+        for c, f, r in zip(self.cover_constrs, self.fwd, self.rev):
+            m.chgCoeff(c, y_list[f], 1.0)
+            m.chgCoeff(c, y_list[r], 1.0)
+        # symmetry break against the previous column
+        if b > 0:
+            m.addConstr(self.z_vars[-1] >= z)
+        if self.heuristic_sol and b < len(self.heuristic_sol):
+            cover = self.heuristic_sol[b]
+            z.Start = 1
+            x_start = np.full(x.shape, GRB.UNDEFINED)
+            x_start[[self.index[u] for u in cover[0]], 0] = 1
+            x_start[[self.index[v] for v in cover[1]], 1] = 1
+            x.Start = x_start
+            y_start = np.full(y.shape, GRB.UNDEFINED)
+            y_start[[self.eid[u, v] for u in cover[0] for v in cover[1]]] = 1.0
+            y.Start = y_start
+        if b < len(self.indep_edges):
+            u, v = self.indep_edges[b]
+            x[self.index[u], 0].LB = 1.0
+            x[self.index[v], 1].LB = 1.0
+            y[self.eid[u, v]].LB = 1.0
+            y[self.eid[v, u]].UB = 0.0
+        self.z_vars.append(z)
+        self.x_cols.append(x)
+        self.y_cols.append(y)
+        self.k += 1
+
+    def solve(self):
+        print("k: ", self.k)
+        self.m.optimize()
+        if self.m.status != GRB.OPTIMAL:
+            return None
+        bicliques = []
+        for x in self.x_cols:
+            x_val = x.X
+            A = [u for i, u in enumerate(self.nodes) if x_val[i, 0] > 0.5]
+            B = [u for i, u in enumerate(self.nodes) if x_val[i, 1] > 0.5]
+            if A != [] and B != []:
+                bicliques.append((A, B))
+        return self.m.objVal, bicliques
+
+
+def solve_bottom_up_for_k(G, k, indep_edges, maximal_con, heuristic_sol=None, threads=None, method=None):
+    m, X = build_bottom_up_model_v(G, k, indep_edges, maximal_con, heuristic_sol, threads=threads, method=method)
+    m.optimize()
+    if m.status == GRB.OPTIMAL:
+        return m.objVal, get_v_bicliques(G, X, k)
+    return None
+
+
+def solve_recursive(G, indep_edges=None, maximal_con=True, max_workers=1, heuristic_sol=None, threads=None, method=None):
+    if indep_edges is None:
+        indep_edges = []
+    # no_solution = True
+    start = time.time()
+    k = len(indep_edges)
+    # a known cover caps the search: once k reaches its size it is the optimum,
+    # since every smaller k has already been probed
+    k_cap = len(heuristic_sol) if heuristic_sol else None
+    if max_workers <= 1:
+        # one model for the whole recursion: each failed k extends it by a
+        # single column instead of rebuilding every variable and constraint
+        model = None
+        while True:
+            if k_cap is not None and k >= k_cap:
+                print("Total time: ", time.time() - start)
+                return float(k_cap), heuristic_sol
+            if model is None:
+                model = IncrementalBottomUpModel(G, k, indep_edges, maximal_con, heuristic_sol,
+                                                 threads=threads, method=method)
+            else:
+                model.add_column()
+            result = model.solve()
+            if result is not None:
+                print("Total time: ", time.time() - start)
+                return result
+            k += 1
+    # probe a window of consecutive k values in parallel; each worker process
+    # builds its own model, so Gurobi environments are never shared
+    pool = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        while True:
+            ks = [k + off for off in range(max_workers) if k_cap is None or k + off < k_cap]
+            futures = [pool.submit(solve_bottom_up_for_k, G, ki, indep_edges, maximal_con, heuristic_sol,
+                                   threads=threads, method=method)
+                       for ki in ks]
+            # feasibility is monotone in k, so the first feasible k in
+            # ascending order is the optimum
+            for future in futures:
+                result = future.result()
+                if result is not None:
+                    print("Total time: ", time.time() - start)
+                    return result
+            k += max_workers
+            if k_cap is not None and k >= k_cap:
+                print("Total time: ", time.time() - start)
+                return float(k_cap), heuristic_sol
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def find_heuristic_solution(g: nx.Graph):
+    vertex_cover_number, vertex_cover_set = vertex_cover.solve(g)
+    return heuristic.find_cover(g, vertex_cover_set)
+
+
+def clique_cut_rows(G, DG, eid):
+    # directed-edge row indices and right-hand side of each maximal-clique
+    # cut; singleton cliques from isolated vertices carry no edges, so they
+    # yield no cut (an empty list would otherwise become a float64 array that
+    # MVar indexing rejects)
+    for clique in nx.find_cliques(G):
+        if len(clique) < 2:
+            continue
+        if len(clique) % 2 == 0:
+            clique_num = len(clique) ** 2 / 4
+        else:
+            clique_num = (len(clique) + 1) * (len(clique) - 1) / 4
+        rows = np.array([eid[e] for e in DG.subgraph(clique).edges], dtype=np.int64)
+        yield rows, clique_num
+
+
+def add_maximal_con_v(m, G, DG, Y, k):
+    _, _, _, _, _, eid = directed_edge_arrays(G, DG)
+    for rows, clique_num in clique_cut_rows(G, DG, eid):
+        # one tensor constraint covers every biclique column b at once
+        cliqueConstr = m.addConstr(Y[rows, :].sum(axis=0) <= clique_num)
+        cliqueConstr.Lazy = 2
+
+
+def add_initial_v(heuristic_sol, X, Y, Z, index, eid):
+    # assemble the MIP start as whole arrays and push them with one attribute
+    # write per tensor instead of one API call per variable; entries outside
+    # the seeded covers stay undefined
+    x_start = np.full(X.shape, GRB.UNDEFINED)
+    y_start = np.full(Y.shape, GRB.UNDEFINED)
+    z_start = np.full(Z.shape, GRB.UNDEFINED)
+    for b, cover in enumerate(heuristic_sol):
+        z_start[b] = 1
+        x_start[[index[u] for u in cover[0]], b, 0] = 1
+        x_start[[index[v] for v in cover[1]], b, 1] = 1
+        y_start[[eid[u, v] for u in cover[0] for v in cover[1]], b] = 1.0
+    X.Start = x_start
+    Y.Start = y_start
+    Z.Start = z_start
+
+
+def fix_indep_edges_v(indep_edges, X, Y, index, eid):
+    for b, (u, v) in enumerate(indep_edges):
+        X[index[u], b, 0].LB = 1.0
+        X[index[v], b, 1].LB = 1.0
+        Y[eid[u, v], b].LB = 1.0
+        Y[eid[v, u], b].UB = 0.0
+    return
+
+
+def add_base_constr_v(m, G, DG, X, Y, Z, k):
+    nodes, index, dir_edges, us, vs, eid = directed_edge_arrays(G, DG)
+    # coupling constraints
+    m.addConstr(X <= Z.reshape((1, k, 1)))
+    # covering constraints
+    if G.number_of_edges() > 0:
+        fwd = np.array([eid[u, v] for u, v in G.edges])
+        rev = np.array([eid[v, u] for u, v in G.edges])
+        m.addConstr((Y[fwd] + Y[rev]).sum(axis=1) >= 1)
+    # node assignment constraints
+    m.addConstr(X[:, :, 0] + X[:, :, 1] <= Z)
+    # node and edge constraints
+    if len(dir_edges) > 0:
+        m.addConstr(Y <= X[us, :, 0])
+        m.addConstr(Y <= X[vs, :, 1])
+        m.addConstr(Y >= X[us, :, 0] + X[vs, :, 1] - Z)
+    uc, vc = complement_edge_arrays(G, nodes)
+    if len(uc) > 0:
+        m.addConstr(X[uc, :, 0] + X[vc, :, 1] <= Z)
+    return
+
+
+# Dual version implementation of g
+def solve_v(G, heuristic_sol, indep_edges=None, maximal_con=False, threads=None, method=None):
+    if indep_edges is None:
+        indep_edges = []
+    # define model
+    m = gp.Model()
+    # set a one-minute time limit
+    m.Params.TimeLimit = 300
+    # m.Params.Cuts = 0
+    configure_solver(m, threads=threads, method=method)
+    # maximum number of biclique covers
+    k = len(heuristic_sol)
+    DG = G.to_directed()
+    print("k: ", k)
+    nodes, index, dir_edges, us, vs, eid = directed_edge_arrays(G, DG)
+    # define vars
+    Z = m.addMVar(k, vtype=GRB.BINARY, name="z")
+    X = m.addMVar((len(nodes), k, 2), vtype=GRB.BINARY, name="x")
+    Y = m.addMVar((len(dir_edges), k), lb=0.0, ub=1.0, vtype=GRB.CONTINUOUS, name="y")
+    if maximal_con:
+        add_maximal_con_v(m, G, DG, Y, k)
+    # warm start X vars
+    add_initial_v(heuristic_sol, X, Y, Z, index, eid)
+    fix_indep_edges_v(indep_edges, X, Y, index, eid)
+    # define objective function
+    m.setObjective(Z.sum(), sense=GRB.MINIMIZE)
+    # symmetry-break constraints
+    if k > 1:
+        m.addConstr(Z[:-1] >= Z[1:])
+    add_base_constr_v(m, G, DG, X, Y, Z, k)
+    m.optimize()
+    print('Objective: ', m.objVal)
+    return get_v_bicliques(G, X, k)
+
+
+# Return an edge heuristic_solution
+def heuristic_greedy(H, threads=None, method=None):
+    G = H.copy()
+    for u, v in G.edges:
+        G.edges[u, v]["w"] = 1.0
+    DG = G.to_directed()
+    bcs = []
+    # build the model once: only the edge weights change between iterations,
+    # so each pass rewrites the objective coefficients and re-optimizes,
+    # letting Gurobi keep its previous solution as a start
+    m = gp.Model()
+    # set a one-minute time limit
+    m.Params.TimeLimit = 60
+    configure_solver(m, threads=threads, method=method)
+    # define vars
+    X = m.addVars(G.nodes, range(2), vtype=GRB.BINARY, name="x")
+    Y = m.addVars(DG.edges, lb=0.0, ub=1.0, vtype=GRB.CONTINUOUS, name="y")
+
+    # node assignment constraints
+    m.addConstrs(X[v, 0] + X[v, 1] <= 1 for v in G.nodes)
+
+    # node and edge constraints
+    m.addConstrs(Y[u, v] <= X[u, 0] for u, v in DG.edges)
+    m.addConstrs(Y[u, v] <= X[v, 1] for u, v in DG.edges)
+    m.addConstrs(Y[u, v] >= X[u, 0] + X[v, 1] - 1 for u, v in DG.edges)
+
+    nodes = list(G.nodes)
+    uc, vc = complement_edge_arrays(G, nodes)
+    m.addConstrs(X[nodes[i], 0] + X[nodes[j], 1] <= 1
+                 for i, j in zip(uc.tolist(), vc.tolist()))
+    m.ModelSense = GRB.MAXIMIZE
+    # both orientations of an edge carry the edge's weight
+    y_list, y_edges = [], []
+    for u, v in G.edges:
+        y_list += [Y[u, v], Y[v, u]]
+        y_edges += [(u, v), (u, v)]
+    while True:
+        m.setAttr('Obj', y_list, [G.edges[e]["w"] for e in y_edges])
+        m.optimize()
+        if m.status == GRB.OPTIMAL or m.status == GRB.TIME_LIMIT:
+            if m.getObjective().getValue() == 0:
+                return bcs
+            bc = [(u, v) for u, v in G.edges if Y[u, v].x + Y[v, u].x > 0.5]
+            for u, v in bc:
+                G.edges[u, v]["w"] = 0.0
+            bcs.append(bc)
+        else:
+            print("Can't get a heuristic sol.")
+            return []
+
+
+def solve(G, heuristic_sol, indep_edges=None, threads=None, method=None):
+    if indep_edges is None:
+        indep_edges = []
+
+    # define model
+    m = gp.Model()
+    # set a one-minute time limit
+    m.Params.TimeLimit = 300
+    configure_solver(m, threads=threads, method=method)
+    # maximum number of biclique covers
+    k = len(heuristic_sol)
+    print("k: ", k)
+    # define vars
+    Z = m.addVars(range(k), vtype=GRB.BINARY, name="z")
+    Y = m.addVars(G.edges, range(k), vtype=GRB.BINARY, name="y")
+    # warm start Y vars
+    for b, cover in enumerate(heuristic_sol):
+        # print ("b, ", b)
+        for (u, v) in cover:
+            # print("(u, v): ", (u,v))
+            Y[u, v, b].start = 1.0
+    # fix z vars
+    for b, (u, v) in enumerate(indep_edges):
+        Z[b].lb = 1
+        Y[u, v, b].lb = 1
+    # define objective function
+    m.setObjective(gp.quicksum(Z), sense=GRB.MINIMIZE)
+    # symmetry-break constraints
+    m.addConstrs(Z[b] >= Z[b + 1] for b in range(k - 1))
+    # coupling constraints
+    m.addConstrs(Y[u, v, b] <= Z[b] for u, v in G.edges for b in range(k))
+    # covering constraints
+    m.addConstrs(gp.quicksum(Y[u, v, b] for b in range(k)) >= 1 for u, v in G.edges)
+    nodes = list(G.nodes)
+    index = {v: i for i, v in enumerate(nodes)}
+    adj = nx.to_scipy_sparse_array(G, nodelist=nodes, format='csr', dtype=bool)
+    edges = list(G.edges)
+    # map both orientations to the stored Y key
+    key_of = {}
+    for u, v in edges:
+        key_of[u, v] = key_of[v, u] = (u, v)
+    # cycle-3 elimination constraints: pairing each edge only with common
+    # neighbors beyond both endpoints yields every triangle exactly once, so no
+    # quadratic membership scan over already-collected cycles is needed
+    list_of_C_3 = []
+    for u, v in edges:
+        lo, hi = (u, v) if u < v else (v, u)
+        for j in nx.common_neighbors(G, lo, hi):
+            if j > hi:
+                list_of_C_3.append((key_of[lo, hi], key_of[lo, j], key_of[hi, j]))
+    # edge conflict pairs: find the endpoint-disjoint pairs and their cross
+    # edges with vectorized adjacency gathers instead of per-pair set
+    # construction and edge-membership tests
+    conflict_pairs = []
+    if len(edges) > 1:
+        edge_arr = np.array([(index[u], index[v]) for u, v in edges])
+        iu, ju = np.triu_indices(len(edges), k=1)
+        ea, eb = edge_arr[iu].T
+        ec, ed = edge_arr[ju].T
+        disjoint = (ea != ec) & (ea != ed) & (eb != ec) & (eb != ed)
+        iu, ju = iu[disjoint], ju[disjoint]
+        # cross-edge indicators for each surviving pair
+        cu, cv = adj[ec, ea][disjoint], adj[ec, eb][disjoint]
+        du, dv = adj[ed, ea][disjoint], adj[ed, eb][disjoint]
+        for t in range(len(iu)):
+            u, v = edges[iu[t]]
+            c, d = edges[ju[t]]
+            cross_c = [key_of[c, u]] if cu[t] else []
+            if cv[t]:
+                cross_c.append(key_of[c, v])
+            cross_d = [key_of[d, u]] if du[t] else []
+            if dv[t]:
+                cross_d.append(key_of[d, v])
+            conflict_pairs.append(((u, v), (c, d), cross_c, cross_d))
+    # instead of storing every cycle/conflict row upfront as a Lazy=2
+    # constraint, generate only the violated ones at each incumbent through a
+    # MIPSOL callback; the model keeps just the covering/coupling core
+    y_keys = list(Y.keys())
+    y_list = [Y[key] for key in y_keys]
+    pos = {key: t for t, key in enumerate(y_keys)}
+    cycle_cuts = [tuple(pos[(*e, b)] for e in cycle)
+                  for cycle in list_of_C_3 for b in range(k)]
+    conflict_cuts = []
+    for (uv, cd, cross_c, cross_d) in conflict_pairs:
+        for b in range(k):
+            lhs = (pos[(*uv, b)], pos[(*cd, b)])
+            conflict_cuts.append((lhs, [pos[(*e, b)] for e in cross_c]))
+            conflict_cuts.append((lhs, [pos[(*e, b)] for e in cross_d]))
+
+    def cut_callback(model, where):
+        if where != GRB.Callback.MIPSOL:
+            return
+        val = model.cbGetSolution(y_list)
+        for i, j, l in cycle_cuts:
+            if val[i] + val[j] + val[l] > 2 + 1e-6:
+                model.cbLazy(y_list[i] + y_list[j] + y_list[l] <= 2)
+        for (i, j), rhs in conflict_cuts:
+            if val[i] + val[j] > 1 + sum(val[r] for r in rhs) + 1e-6:
+                model.cbLazy(y_list[i] + y_list[j] <= 1 + gp.quicksum(y_list[r] for r in rhs))
+
+    m.Params.LazyConstraints = 1
+    m.optimize(cut_callback)
+    return get_v_bicliques_from_e(G, Y, k)
@@ -1,8 +1,7 @@
-import json
 from datetime import datetime
 from functools import cached_property
 
-from pydantic import BaseModel, parse_obj_as, ValidationError
+from pydantic import BaseModel, ValidationError
 
 from src.bc_bounds import LBComputeMethod, UBComputeMethod
 from src.util import get_file_name_and_extension
@@ -20,9 +19,15 @@ class RunConfig(BaseModel):
     conflict_inequalities: bool | None = None
     common_neighbor_inequalities: bool | None = None
     use_callback: bool | None = None
+    write_model: bool | None = None
+    verify_solution: bool | None = None
     time_limit: int | None = None
+    threads: int | None = None
+    method: int | None = None
+    mip_focus: int | None = None
+    presolve: int | None = None
 
-    @property
+    @cached_property
     def resolved_gname(self) -> str:
         if self.name is not None:
             return (
@@ -42,7 +47,13 @@ class ReportConfig(BaseModel):
     default_conflict_inequalities: bool = False
     default_common_neighbor_inequalities: bool = False
     default_use_callback: bool = False
+    default_write_model: bool = False
+    default_verify_solution: bool = False
     default_time_limit: int | None = 3600
+    default_threads: int | None = None
+    default_method: int | None = None
+    default_mip_focus: int | None = None
+    default_presolve: int | None = None
     run_configs: list[RunConfig]
     create_log_files: bool = False
 
@@ -50,7 +61,7 @@ class ReportConfig(BaseModel):
     def timestamp(self) -> int:
         return int(datetime.now().timestamp())
 
-    @property
+    @cached_property
     def resolved_report_name(self) -> str:
         if '$ts' not in self.report_name:
             raise ValueError("Report name must contain a timestamp declared by $ts")
@@ -58,11 +69,13 @@ class ReportConfig(BaseModel):
 
 
 def read_report_config_file(config_file_path: str) -> ReportConfig:
-    with open(config_file_path, 'r') as config_file:
-        config_data = json.load(config_file)
+    # hand the raw bytes straight to pydantic's rust core, skipping the
+    # Python-level json.loads and the deprecated parse_obj_as shim
+    with open(config_file_path, 'rb') as config_file:
+        config_data = config_file.read()
 
     try:
-        config = parse_obj_as(ReportConfig, config_data)
+        config = ReportConfig.model_validate_json(config_data)
         return config
     except ValidationError as e:
         for error in e.errors():
@@ -4,20 +4,35 @@ from itertools import combinations
 import gurobipy as gp
 from gurobipy import GRB
 import networkx as nx
+import numpy as np
 
 from src.util import chronometer, poisson, save_graph_in_store, get_graphs_in_store
 
 
+def power2_edges(g: nx.Graph):
+    # stream the edges of g^2 without materializing the power graph: yield
+    # each pair (u, w) at distance one or two exactly once, with u < w
+    for u in g.nodes:
+        adj_u = g.adj[u]
+        seen = set(adj_u)
+        seen.add(u)
+        for v in adj_u:
+            if u < v:
+                yield u, v
+            for w in g.adj[v]:
+                if w > u and w not in seen:
+                    seen.add(w)
+                    yield u, w
+
+
 def solve(g):
     m = gp.Model()
-    # find power graph g^2
-    H = nx.power(g, 2)
     # define vars
-    X = m.addVars(H.nodes, vtype=GRB.BINARY, name="x")
+    X = m.addVars(g.nodes, vtype=GRB.BINARY, name="x")
     # define objective function
     m.setObjective(gp.quicksum(X), sense=GRB.MAXIMIZE)
-    # add covering constraints
-    m.addConstrs(X[u] + X[v] <= 1 for u, v in H.edges)
+    # add covering constraints over the power graph g^2, streamed lazily
+    m.addConstrs(X[u] + X[v] <= 1 for u, v in power2_edges(g))
     # set a one-minute time limit
     m.Params.TimeLimit = 60
     # optimize
@@ -74,6 +89,13 @@ def print_independent_sets(g: nx.Graph, g_name, max_indep_sets: int = None):
         print('\t', count, ': {', ', '.join([str(v) for v in independent_set]), '}')
 
 
+def _iter_bits(mask: int):
+    while mask:
+        bit = mask & -mask
+        yield bit.bit_length() - 1
+        mask ^= bit
+
+
 def generate_random_independent_sets(
         n: int, r: int, min_size: int = 1, max_size: int = None) -> SetOfSets:
     if max_size is None:
@@ -82,29 +104,59 @@ def generate_random_independent_sets(
             or min_size < 1 or min_size > n or max_size < 1 or max_size > n):
         raise ValueError('Invalid input for min_size or max_size. They need to be integers within [1, n].')
 
-    sets = set()
-    while len(sets) != r:
-        a, b = min_size, max_size + 1
-        weights = [poisson(p, x_0=a, mu=(b-a)/3) for p in range(a, b)]
-        size = choices(range(a, b), weights=weights, k=1)[0]
-        rs = frozenset(choices(range(n), k=size))
-        # purge subsets
-        if any(rs.issubset(s) for s in sets):
+    # the size distribution does not depend on iteration state: build and
+    # normalize it once instead of recomputing the Poisson weights per draw
+    a, b = min_size, max_size + 1
+    weights = np.array([poisson(p, x_0=a, mu=(b-a)/3) for p in range(a, b)])
+    p_size = weights / weights.sum()
+    sizes = np.arange(a, b)
+
+    # each candidate set is an int bitmask over the n vertices, so a subset
+    # test is a single whole-word AND instead of an element-wise issubset
+    # scan; bucketing the masks by size narrows the scan further, since a
+    # superset of the candidate can only sit in a bucket of equal or larger
+    # size and a stored subset only in one of equal or smaller size
+    by_size: dict[int, set[int]] = {}
+    count = 0
+    while count != r:
+        size = int(np.random.choice(sizes, p=p_size))
+        cand = 0
+        # sample without replacement so the candidate really has `size`
+        # vertices; choices(..., k=size) drew with replacement and silently
+        # produced smaller sets on collisions
+        for v in np.random.choice(n, size=size, replace=False):
+            cand |= 1 << int(v)
+        if any(cand & m == cand
+               for sz, bucket in by_size.items() if sz >= size
+               for m in bucket):
             continue
-        sets = {s for s in sets if not s.issubset(rs)}
-        sets.add(rs)
-    return frozenset(sets)
+        # purge stored subsets of the accepted candidate
+        for sz in [sz for sz in by_size if sz <= size]:
+            bucket = by_size[sz]
+            purged = {m for m in bucket if m & cand == m}
+            if purged:
+                bucket -= purged
+                count -= len(purged)
+                if not bucket:
+                    del by_size[sz]
+        by_size.setdefault(size, set()).add(cand)
+        count += 1
+    return frozenset(
+        frozenset(_iter_bits(m)) for bucket in by_size.values() for m in bucket)
 
 
 def create_graph_from_maximal_indep_sets(sets: SetOfSets) -> nx.Graph:
-    g = nx.Graph()
+    # collect the in-set pairs as a deduplicated set of sorted tuples and emit
+    # the complement edges directly, instead of one add_edge call per pair
+    # followed by a full nx.complement pass over the intermediate graph
+    nodes = set().union(*sets)
+    pairs = set()
     for s in sets:
-        if len(s) == 1:
-            g.add_node(list(s)[0])
-            continue
-        for u, v in combinations(s, r=2):
-            g.add_edge(u, v)
-    return nx.complement(g)
+        pairs.update((u, v) if u < v else (v, u) for u, v in combinations(s, r=2))
+    g = nx.Graph()
+    g.add_nodes_from(nodes)
+    g.add_edges_from(pair for pair in combinations(sorted(nodes), 2) if pair not in pairs)
+    return g
 
 
 def diff_indep_sets(g: nx.Graph, indep_sets: SetOfSets) -> SetOfSets:
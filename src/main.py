@@ -35,7 +35,7 @@ def create_and_save_model_comparison_report(config: ReportConfig, **kwargs):
                 g=g, g_name=run_config.resolved_gname, dir_logs=dir_ts_logs if config.create_log_files else None, config=run_config, default_config=config)
             # calculate values
             try:
-                k, t_k = chronometer(model.upper_bound)
+                k, t_k = chronometer(lambda: model.upper_bound)
                 ub, time = chronometer(f=model.solve)
                 lb = model.m.ObjBoundC if not model.infeasible_or_unsolved() else None
             except Exception as e:
@@ -1,5 +1,3 @@
-from itertools import combinations
-
 import gurobipy as gp
 import networkx as nx
 from gurobipy import GRB
@@ -31,24 +29,70 @@ def indep_callback(model: gp.Model, where: int):
             model.cbCut(gp.quicksum(model._y[v, j, 0] + model._y[v, j, 1] for v in indep_set) <= model._z[j])
 
 
+def crossing_callback(model: gp.Model, where: int):
+    """
+    Lazily separates the disjoint-edge crossing constraints (4d)-(4h) of the
+    natural model, adding only the inequalities violated by an incumbent.
+
+    :param model: Gurobi model, expects the following variables to be added:
+        - _x and _z variables of the natural model;
+        - _k storing the calculated maximum number of bicliques; and
+        - _disjoint_edges holding the precomputed disjoint-edge crossing pool.
+    :param where: Gurobi internal variable that represent place where the callback function was called.
+    """
+    if where != GRB.Callback.MIPSOL:
+        return
+    x, z = model._x, model._z
+    x_val = model.cbGetSolution(x)
+    z_val = model.cbGetSolution(z)
+    for a, b, c, d, cr1, cr2 in model._disjoint_edges:
+        for i in range(model._k):
+            lhs = x_val[a, b, i] + x_val[c, d, i]
+            if lhs <= z_val[i] + 1e-4:
+                continue
+            # 4d
+            if cr1 < 2 and cr2 < 2:
+                model.cbLazy(x[a, b, i] + x[c, d, i] <= z[i])
+            # 4f
+            elif cr1 == 2 and cr2 < 2:
+                if lhs > z_val[i] + var_swap(x_val, a, d, i) + 1e-4:
+                    model.cbLazy(x[a, b, i] + x[c, d, i] <= z[i] + var_swap(x, a, d, i))
+                if lhs > z_val[i] + var_swap(x_val, b, c, i) + 1e-4:
+                    model.cbLazy(x[a, b, i] + x[c, d, i] <= z[i] + var_swap(x, b, c, i))
+            # 4g
+            elif cr1 < 2 and cr2 == 2:
+                if lhs > z_val[i] + var_swap(x_val, a, c, i) + 1e-4:
+                    model.cbLazy(x[a, b, i] + x[c, d, i] <= z[i] + var_swap(x, a, c, i))
+                if lhs > z_val[i] + var_swap(x_val, b, d, i) + 1e-4:
+                    model.cbLazy(x[a, b, i] + x[c, d, i] <= z[i] + var_swap(x, b, d, i))
+            # 4h
+            else:
+                if lhs > z_val[i] + var_swap(x_val, a, c, i) + var_swap(x_val, a, d, i) + 1e-4:
+                    model.cbLazy(
+                        x[a, b, i] + x[c, d, i] <= z[i] + var_swap(x, a, c, i) + var_swap(x, a, d, i))
+                if lhs > z_val[i] + var_swap(x_val, b, c, i) + var_swap(x_val, b, d, i) + 1e-4:
+                    model.cbLazy(
+                        x[a, b, i] + x[c, d, i] <= z[i] + var_swap(x, b, c, i) + var_swap(x, b, d, i))
+
+
 class NaturalModel(MBCModel):
 
     def _add_variables(self):
         # 4j
-        self.z = self.m.addVars(self.bicliques, vtype=GRB.CONTINUOUS, lb=0.0, ub=1.0, name="z")
-        self.x = self.m.addVars(self.g.edges, self.bicliques, vtype=GRB.BINARY, name="x")
+        self.z = self.m.addMVar(self.upper_bound, vtype=GRB.CONTINUOUS, lb=0.0, ub=1.0, name="z")
+        self.x = self.m.addVars(self.edge_list, self.bicliques, vtype=GRB.BINARY, name="x")
 
     def _set_objective(self):
         # 4a
-        self.m.setObjective(gp.quicksum(self.z), sense=GRB.MINIMIZE)
+        self.m.setObjective(self.z.sum(), sense=GRB.MINIMIZE)
 
     def _add_constraints(self):
         m, x, z = self.m, self.x, self.z
 
         # 4b
-        m.addConstrs(x[u, v, i] <= z[i] for u, v in self.g.edges for i in self.bicliques)
+        m.addConstrs(x[u, v, i] <= z[i] for u, v in self.edge_list for i in self.bicliques)
         # 4c
-        m.addConstrs(gp.quicksum(x[u, v, i] for i in self.bicliques) >= 1 for u, v in self.g.edges)
+        m.addConstrs(gp.quicksum(x[u, v, i] for i in self.bicliques) >= 1 for u, v in self.edge_list)
         # 4e
         for cycle in nx.simple_cycles(self.g, length_bound=3):  # TODO: fix me
             if len(cycle) != 3:
@@ -58,9 +102,9 @@ class NaturalModel(MBCModel):
                 gp.quicksum(var_swap(x, u, v, i) for u, v in cycle_edges) <= 2 * z[i]
                 for i in self.bicliques)
 
-        for e, f, cr1, cr2 in self.get_disjoint_edges():
-            a, b = e
-            c, d = f
+        # with the callback enabled, the crossing constraints below are
+        # separated lazily from incumbents instead of added up front
+        for a, b, c, d, cr1, cr2 in () if self._use_callback else self._disjoint_edge_rows():
             # 4d
             if cr1 < 2 and cr2 < 2:
                 m.addConstrs(x[a, b, i] + x[c, d, i] <= z[i] for i in self.bicliques)
@@ -81,55 +125,73 @@ class NaturalModel(MBCModel):
                     x[a, b, i] + x[c, d, i] <=
                     z[i] + var_swap(x, b, c, i) + var_swap(x, b, d, i) for i in self.bicliques)
         # 4i
-        m.addConstrs(z[i] >= z[i + 1] for i in range(self.upper_bound() - 1))
+        m.addConstrs(z[i] >= z[i + 1] for i in range(self.upper_bound - 1))
         # independent edges constraints
         if self._can_add_indep_edges_constraints():
             self._add_independent_edges_constraints()
 
     def _check_biclique_cover(self) -> bool:
+        # pull all solution values in two bulk queries instead of one API
+        # round-trip per variable access
+        x_val = self.m.getAttr('X', self.x)
+        z_val = self.z.X
         # check it's a cover
-        if not any(self.x[u, v, i].X == 1 for u, v in self.g.edges for i in self.bicliques):
+        if not any(x_val[u, v, i] == 1 for u, v in self.edge_list for i in self.bicliques):
             return False
         # check it's a biclique cover
         for i in self.bicliques:
-            if self.z[i].X != 1:
+            if z_val[i] != 1:
                 continue
-            edges = [(u, v) for u, v in self.g.edges if self.x[u, v, i].X == 1]
+            edges = [(u, v) for u, v in self.edge_list if x_val[u, v, i] == 1]
             if not is_biclique(graph=self.g, edges=edges):
                 return False
         return True
 
     def _do_warm_start(self, indep_edges: list, vertex_cover: list):
+        # collect the touched variables and push each attribute with one bulk
+        # setAttr call instead of a Gurobi round-trip per variable
         assign = dict()
+        start_vars = []
         for i, s in enumerate(vertex_cover):
             edges = []
             for e in self.g.edges(s):
-                self.x[min(e), max(e), i].start = 1
+                start_vars.append(self.x[min(e), max(e), i])
                 edges.append(e)
             assign[i] = edges
+        if start_vars:
+            self.m.setAttr('Start', start_vars, [1.0] * len(start_vars))
         indep_edges = set(indep_edges)
         if self._edge_fix:
-            for i in assign.keys():
-                for e in assign[i]:
-                    if e in indep_edges:
-                        self.x[min(e), max(e), i].lb = 1
+            fix_vars = [self.x[min(e), max(e), i]
+                        for i in assign.keys() for e in assign[i] if e in indep_edges]
+            if fix_vars:
+                self.m.setAttr('LB', fix_vars, [1.0] * len(fix_vars))
 
     def _pre_solve(self):
-        for b in range(self.lower_bound()):
-            self.z[b].lb = 1
+        self.z[:self.lower_bound].LB = 1.0
+        if self._use_callback:
+            self._add_callback()
         if self._warm_start:
-            _, indep_edges = self.get_lb_and_indep_edges()
-            _, vertex_cover = self.get_ub_and_vertex_cover()
+            _, indep_edges = self.get_lb_and_indep_edges
+            _, vertex_cover = self.get_ub_and_vertex_cover
             self._do_warm_start(indep_edges=indep_edges, vertex_cover=vertex_cover)
 
     def _add_independent_edges_constraints(self):
-        _, edges = self.get_lb_and_indep_edges()
+        _, edges = self.get_lb_and_indep_edges
         for biclique in self.bicliques:
             if biclique >= len(edges):
                 return
             e = edges[biclique]
             self.x[e[0], e[1], biclique].lb = 1
 
+    def _add_callback(self):
+        self.m.Params.LazyConstraints = 1
+        self.m._k = self.upper_bound
+        self.m._x = self.x
+        self.m._z = self.z
+        self.m._disjoint_edges = list(self._disjoint_edge_rows())
+        self._callback = crossing_callback
+
     @classmethod
     def name(cls) -> str:
         return 'Compact Natural Model'
@@ -139,36 +201,34 @@ class ExtendedModel(MBCModel):
 
     def _add_variables(self):
         # 5h
-        self.z = self.m.addVars(self.bicliques, vtype=GRB.BINARY, name="z")
-        self.x = self.m.addVars(self.directed.edges, self.bicliques, vtype=GRB.BINARY, name="x")
+        self.z = self.m.addMVar(self.upper_bound, vtype=GRB.BINARY, name="z")
+        self.x = self.m.addVars(self.directed_edge_list, self.bicliques, vtype=GRB.BINARY, name="x")
         self.y = self.m.addVars(self.g.nodes, self.bicliques, range(2), vtype=GRB.BINARY, name="y")
 
     def _set_objective(self):
         # 5a
-        self.m.setObjective(gp.quicksum(self.z), sense=GRB.MINIMIZE)
+        self.m.setObjective(self.z.sum(), sense=GRB.MINIMIZE)
 
     def _add_constraints(self):
         m, x, y, z = self.m, self.x, self.y, self.z
 
         # 5b
-        m.addConstrs(x[u, v, i] <= y[u, i, 0] for u, v in self.directed.edges for i in self.bicliques)
-        m.addConstrs(x[u, v, i] <= y[v, i, 1] for u, v in self.directed.edges for i in self.bicliques)
+        m.addConstrs(x[u, v, i] <= y[u, i, 0] for u, v in self.directed_edge_list for i in self.bicliques)
+        m.addConstrs(x[u, v, i] <= y[v, i, 1] for u, v in self.directed_edge_list for i in self.bicliques)
         # 5c
         m.addConstrs(y[u, i, 0] + y[v, i, 1] <= z[i] + x[u, v, i]
-                     for u, v in self.directed.edges for i in self.bicliques)
+                     for u, v in self.directed_edge_list for i in self.bicliques)
         # 5d
         m.addConstrs(y[u, i, 0] + y[u, i, 1] <= z[i] for u in self.g.nodes for i in self.bicliques)
         # 5e
-        for u, v in self.g.edges:
+        for u, v in self.edge_list:
             m.addConstr(gp.quicksum(x[u, v, i] + x[v, u, i] for i in self.bicliques) >= 1)
         # 5f
-        for u, v in combinations(self.g.nodes, r=2):
-            if self.g.has_edge(u, v):
-                continue
+        for u, v in self._edge_labels(self.complement_edges):
             m.addConstrs(y[u, i, 0] + y[v, i, 1] <= z[i] for i in self.bicliques)
             m.addConstrs(y[v, i, 0] + y[u, i, 1] <= z[i] for i in self.bicliques)
         # 5g
-        m.addConstrs(z[i] >= z[i + 1] for i in range(self.upper_bound() - 1))
+        m.addConstrs(z[i] >= z[i + 1] for i in range(self.upper_bound - 1))
         # independent edges constraints
         if self._can_add_indep_edges_constraints():
             self._add_independent_edges_constraints()
@@ -180,31 +240,34 @@ class ExtendedModel(MBCModel):
             self._add_common_neighbor_inequalities()
 
     def _check_biclique_cover(self) -> bool:
+        # pull all solution values in two bulk queries instead of one API
+        # round-trip per variable access
+        x_val = self.m.getAttr('X', self.x)
+        z_val = self.z.X
         # check it's a cover
-        if not any(self.x[u, v, i].X == 1 or self.x[v, u, i].X == 1
-                   for u, v in self.g.edges for i in self.bicliques):
+        if not any(x_val[u, v, i] == 1 or x_val[v, u, i] == 1
+                   for u, v in self.edge_list for i in self.bicliques):
             return False
         # check it's a biclique cover
         for i in self.bicliques:
-            if self.z[i].X != 1:
+            if z_val[i] != 1:
                 continue
-            edges = [(u, v) for u, v in self.g.edges if self.x[u, v, i].X == 1 or self.x[v, u, i].X == 1]
+            edges = [(u, v) for u, v in self.edge_list if x_val[u, v, i] == 1 or x_val[v, u, i] == 1]
             if not is_biclique(graph=self.g, edges=edges):
                 return False
         return True
 
     def _pre_solve(self):
-        for b in range(self.lower_bound()):
-            self.z[b].lb = 1
+        self.z[:self.lower_bound].LB = 1.0
         if self._use_callback:
             self._add_callback()
         if self._warm_start:
-            _, indep_edges = self.get_lb_and_indep_edges()
-            _, vertex_cover = self.get_ub_and_vertex_cover()
+            _, indep_edges = self.get_lb_and_indep_edges
+            _, vertex_cover = self.get_ub_and_vertex_cover
             self._do_warm_start(indep_edges=indep_edges, vertex_cover=vertex_cover)
 
     def _add_independent_edges_constraints(self):
-        _, edges = self.get_lb_and_indep_edges()
+        _, edges = self.get_lb_and_indep_edges
         for biclique in self.bicliques:
             if biclique >= len(edges):
                 return
@@ -213,9 +276,8 @@ class ExtendedModel(MBCModel):
             self.x[b, a, biclique].lb = 0
 
     def _add_conflict_inequalities(self):
-        for u, v in combinations(self.g.nodes, r=2):
-            if self.power_graph.has_edge(u, v):
-                continue
+        # pairs at distance greater than two, straight from the index array
+        for u, v in self._edge_labels(self.power_complement_edges):
             conflict_inequalities = self.m.addConstrs(
                 self.y[u, i, 0] + self.y[u, i, 1] + self.y[v, i, 0] + self.y[v, i, 1] <= self.z[i]
                 for i in self.bicliques)
@@ -223,9 +285,8 @@ class ExtendedModel(MBCModel):
                 conflict_inequalities[i].Lazy = 1
 
     def _add_common_neighbor_inequalities(self):
-        for u, v in self.power_graph.edges:
-            if self.g.has_edge(u, v):
-                continue
+        # pairs at distance exactly two, straight from the index array
+        for u, v in self._edge_labels(self.distance_two_edges):
             common_neighbors = nx.common_neighbors(self.g, u, v)
             self.m.addConstrs(
                 self.y[u, i, 0] + self.y[v, i, 0] <= self.z[i] + gp.quicksum(self.y[c, i, 1] for c in common_neighbors)
@@ -235,34 +296,37 @@ class ExtendedModel(MBCModel):
                 for i in self.bicliques)
 
     def _do_warm_start(self, indep_edges: list, vertex_cover: list):
+        # collect the touched variables and push each attribute with one bulk
+        # setAttr call instead of a Gurobi round-trip per variable
         assign = dict()
+        start_vars, start_vals = [], []
         for i, s in enumerate(vertex_cover):
             edges = []
             for e in self.g.edges(s):
                 a, b = e
-                self.x[a, b, i].start = 1
-                self.x[b, a, i].start = 0
-                self.y[a, i, 0].start = 1
-                self.y[a, i, 1].start = 0
-                self.y[b, i, 1].start = 1
-                self.y[b, i, 0].start = 0
+                start_vars += [self.x[a, b, i], self.x[b, a, i],
+                               self.y[a, i, 0], self.y[a, i, 1],
+                               self.y[b, i, 1], self.y[b, i, 0]]
+                start_vals += [1.0, 0.0, 1.0, 0.0, 1.0, 0.0]
                 edges.append(e)
             assign[i] = edges
+        if start_vars:
+            self.m.setAttr('Start', start_vars, start_vals)
         indep_edges = set(indep_edges)
         if self._edge_fix:
+            lb_vars, ub_vars = [], []
             for i in assign.keys():
                 for e in assign[i]:
                     if e in indep_edges:
                         a, b = e
-                        self.x[a, b, i].lb = 1
-                        self.x[b, a, i].ub = 0
-                        self.y[a, i, 0].lb = 1
-                        self.y[a, i, 1].ub = 0
-                        self.y[b, i, 1].lb = 1
-                        self.y[b, i, 0].ub = 0
+                        lb_vars += [self.x[a, b, i], self.y[a, i, 0], self.y[b, i, 1]]
+                        ub_vars += [self.x[b, a, i], self.y[a, i, 1], self.y[b, i, 0]]
+            if lb_vars:
+                self.m.setAttr('LB', lb_vars, [1.0] * len(lb_vars))
+                self.m.setAttr('UB', ub_vars, [0.0] * len(ub_vars))
 
     def _add_callback(self):
-        self.m._k = self.upper_bound()
+        self.m._k = self.upper_bound
         self.m._y = self.y
         self.m._z = self.z
         self.m._g = self.g